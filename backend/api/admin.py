@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import ContactForm, Review, Program, Housing, SiteSettings, AmazonWishList, Donor, HousingApplication
+from django.utils import timezone
+from .models import ContactForm, Review, Program, Housing, SiteSettings, AmazonWishList, Donor, HousingApplication, QueuedSubmission
 
 
 @admin.register(ContactForm)
@@ -73,6 +74,7 @@ class DonorAdmin(admin.ModelAdmin):
 @admin.register(HousingApplication)
 class HousingApplicationAdmin(admin.ModelAdmin):
     list_display = ['first_name', 'last_name', 'email', 'phone', 'preferred_housing', 'status', 'submitted_at']
+    list_select_related = ['preferred_housing']
     list_filter = ['status', 'submitted_at', 'preferred_housing']
     search_fields = ['first_name', 'last_name', 'email', 'phone']
     readonly_fields = ['submitted_at']
@@ -92,3 +94,16 @@ class HousingApplicationAdmin(admin.ModelAdmin):
             'fields': ('status', 'notes', 'submitted_at')
         }),
     )
+
+
+@admin.register(QueuedSubmission)
+class QueuedSubmissionAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'attempts', 'object_id', 'created_at', 'processed_at']
+    list_filter = ['status', 'kind']
+    readonly_fields = ['created_at', 'claimed_at', 'processed_at']
+    actions = ['requeue']
+
+    @admin.action(description='Requeue selected submissions')
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status='done').update(status='pending', attempts=0, available_at=timezone.now(), claimed_at=None)
+        self.message_user(request, f'{updated} submission(s) requeued.')
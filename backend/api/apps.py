@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class ApiConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if getattr(settings, 'FIREBASE_INIT_ON_READY', True):
+            from .firebase import bootstrap
+            bootstrap.initialize()
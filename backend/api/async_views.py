@@ -0,0 +1,235 @@
+"""
+Native async versions of the public read endpoints, for ASGI deployments.
+
+With settings.ASYNC_PUBLIC_VIEWS on, api.urls routes the site settings,
+public and featured reviews, donor feed, homepage bundle, and the program,
+housing and wish list lists here ahead of the DRF views. Anonymous JSON GETs
+stay on the event loop: rows come from the async ORM, and model versions,
+validators and cached responses from api.cache.acache, which uses the cache's
+async methods unless the backend is in-process. ETags, cache keys and
+response bodies are the same ones the sync views produce, so either can
+serve a client. Everything else (writes, Authorization headers, the
+browsable API, query parameters not handled here) goes to the DRF view.
+"""
+from functools import wraps
+from math import ceil
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import acache, aresponse_cache_key, shared_cache
+from .conditional import aget_anonymous_validators
+from .fast_serializers import get_values_serializer
+from .models import Review, Program, Housing, SiteSettings, AmazonWishList, Donor
+from .renderers import FastJSONRenderer
+from .serializers import (
+    PublicReviewSerializer, ProgramSerializer, ProgramSummarySerializer, HousingSerializer,
+    HousingSummarySerializer, SiteSettingsSerializer, AmazonWishListSerializer, PublicDonorSerializer
+)
+from .views import project
+
+JSON_MEDIA_TYPES = ('application/json', 'application/*', '*/*')
+
+_renderer = FastJSONRenderer()
+
+
+class UseSyncView(Exception):
+    """Raised while building a response the async path doesn't handle"""
+
+
+def accepts_json(request):
+    accept = request.headers.get('Accept', '*/*')
+    # Browsers ask for text/html and get DRF's browsable API
+    return 'text/html' not in accept and any(media_type in accept for media_type in JSON_MEDIA_TYPES)
+
+
+async def serialize(serializer_class, queryset, request):
+    values_serializer = get_values_serializer(serializer_class)
+    if values_serializer is None:
+        raise UseSyncView
+    rows = [row async for row in values_serializer.values(queryset)]
+    return values_serializer.serialize(rows, request)
+
+
+async def paginate(serializer_class, queryset, request):
+    """PageNumberPagination's response for the requested page"""
+    page_size = api_settings.PAGE_SIZE
+    try:
+        number = int(request.GET.get('page', 1))
+    except ValueError:
+        # Includes 'last'; DRF also answers invalid pages
+        raise UseSyncView
+    count = await queryset.acount()
+    if number < 1 or number > max(ceil(count / page_size), 1):
+        raise UseSyncView
+    offset = (number - 1) * page_size
+    results = await serialize(serializer_class, queryset[offset:offset + page_size], request)
+    url = request.build_absolute_uri()
+    previous = None
+    if number > 1:
+        previous = remove_query_param(url, 'page') if number == 2 else replace_query_param(url, 'page', number - 1)
+    return {
+        'count': count,
+        'next': replace_query_param(url, 'page', number + 1) if offset + page_size < count else None,
+        'previous': previous,
+        'results': results,
+    }
+
+
+class PublicEndpoint:
+    """Async GET for one public endpoint, wrapping the sync view for everything else"""
+
+    def __init__(self, build, models, validator_queryset=None, timestamp_field='updated_at', params=()):
+        self.build = build
+        self.models = models
+        self.validator_queryset = validator_queryset
+        self.timestamp_field = timestamp_field
+        self.params = set(params)
+
+    def handles(self, request):
+        return (
+            request.method == 'GET'
+            and 'HTTP_AUTHORIZATION' not in request.META
+            and set(request.GET) <= self.params
+            and accepts_json(request)
+        )
+
+    async def get(self, request):
+        validators = None
+        if self.validator_queryset is not None:
+            validators = await aget_anonymous_validators(request, self.validator_queryset(request), self.timestamp_field)
+            response = get_conditional_response(request, etag=validators[0], last_modified=validators[1])
+            if response is not None:
+                return self.finish(response, validators)
+        if shared_cache():
+            key = await aresponse_cache_key(request, self.models)
+            data = await acache('get', key)
+            if data is None:
+                data = await self.build(request)
+                await acache('set', key, data, settings.PUBLIC_CACHE_TIMEOUT)
+        else:
+            # Not cached with a per-process cache, as in cache_public_response()
+            data = await self.build(request)
+        response = HttpResponse(_renderer.render(data), content_type=_renderer.media_type)
+        return self.finish(response, validators)
+
+    def finish(self, response, validators):
+        if validators is not None:
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Accept',))
+        return response
+
+    def as_view(self, sync_view):
+        sync_view_async = sync_to_async(sync_view)
+
+        # Keeps the DRF view's csrf_exempt, actions and cls for middleware
+        @wraps(sync_view)
+        async def view(request, *args, **kwargs):
+            if self.handles(request):
+                try:
+                    return await self.get(request)
+                except UseSyncView:
+                    pass
+            return await sync_view_async(request, *args, **kwargs)
+        return view
+
+
+def summary_serializer(request, full, summary):
+    return summary if 'summary' in request.GET else full
+
+
+async def settings_public(request):
+    return SiteSettingsSerializer(await SiteSettings.aload(), context={'request': request}).data
+
+
+async def reviews_public(request):
+    return await serialize(PublicReviewSerializer, Review.objects.filter(is_approved=True), request)
+
+
+async def reviews_featured(request):
+    return await serialize(PublicReviewSerializer, Review.objects.filter(is_featured=True, is_approved=True), request)
+
+
+async def donor_feed(request):
+    return await serialize(PublicDonorSerializer, Donor.objects.filter(is_featured=True).order_by('-created_at')[:20], request)
+
+
+async def program_list(request):
+    serializer_class = summary_serializer(request, ProgramSerializer, ProgramSummarySerializer)
+    return await paginate(serializer_class, Program.objects.filter(is_active=True), request)
+
+
+async def housing_list(request):
+    serializer_class = summary_serializer(request, HousingSerializer, HousingSummarySerializer)
+    return await paginate(serializer_class, Housing.objects.filter(is_available=True), request)
+
+
+async def wishlist_list(request):
+    return await paginate(AmazonWishListSerializer, AmazonWishList.objects.filter(is_active=True), request)
+
+
+async def homepage(request):
+    return {
+        'settings': await settings_public(request),
+        'featured_reviews': await reviews_featured(request),
+        'donor_feed': await donor_feed(request),
+        'programs': await serialize(ProgramSerializer, Program.objects.filter(is_active=True), request),
+        'housing': await serialize(HousingSerializer, Housing.objects.filter(is_available=True), request),
+    }
+
+
+# (route, URL name of the sync view it takes over, endpoint). Validator
+# querysets are the ones ConditionalGetMixin fingerprints for the same request.
+PUBLIC_ENDPOINTS = [
+    ('settings/public/', 'settings-public', PublicEndpoint(
+        settings_public, (SiteSettings,),
+        validator_queryset=lambda request: SiteSettings.objects.filter(pk=1),
+    )),
+    ('reviews/public/', 'review-public', PublicEndpoint(
+        reviews_public, (Review,),
+        validator_queryset=lambda request: project(Review.objects.filter(is_approved=True), PublicReviewSerializer),
+    )),
+    ('reviews/featured/', 'review-featured', PublicEndpoint(
+        reviews_featured, (Review,),
+        validator_queryset=lambda request: project(
+            Review.objects.filter(is_featured=True, is_approved=True), PublicReviewSerializer
+        ),
+    )),
+    ('donors/feed/', 'donor-feed', PublicEndpoint(
+        donor_feed, (Donor,),
+        validator_queryset=lambda request: project(
+            Donor.objects.filter(is_featured=True).order_by('-created_at'), PublicDonorSerializer
+        ),
+        timestamp_field='created_at',
+    )),
+    ('programs/', 'program-list', PublicEndpoint(
+        program_list, (Program,),
+        validator_queryset=lambda request: project(
+            Program.objects.filter(is_active=True),
+            summary_serializer(request, ProgramSerializer, ProgramSummarySerializer),
+        ),
+        params=('page', 'summary'),
+    )),
+    ('housing/', 'housing-list', PublicEndpoint(
+        housing_list, (Housing,),
+        validator_queryset=lambda request: project(
+            Housing.objects.filter(is_available=True),
+            summary_serializer(request, HousingSerializer, HousingSummarySerializer),
+        ),
+        params=('page', 'summary'),
+    )),
+    ('wishlists/', 'wishlist-list', PublicEndpoint(
+        wishlist_list, (AmazonWishList,),
+        validator_queryset=lambda request: AmazonWishList.objects.filter(is_active=True),
+        params=('page',),
+    )),
+    ('homepage/', 'homepage', PublicEndpoint(homepage, (SiteSettings, Review, Donor, Program, Housing))),
+]
@@ -1,18 +1,24 @@
 from rest_framework import authentication
 from rest_framework import exceptions
-import firebase_admin
-from firebase_admin import credentials, auth
-import os
-import json
+from firebase_admin import auth
 import logging
 from django.conf import settings
+from .firebase import get_firebase_app
+from .keys import get_key_provider, verify_id_token
+from .metrics import timed
+from .token_cache import VerifiedTokenCache
 
 logger = logging.getLogger(__name__)
 
+# Verified tokens are reused until their exp claim so repeat requests from the
+# admin dashboard skip signature verification entirely
+token_cache = VerifiedTokenCache(max_size=getattr(settings, 'FIREBASE_TOKEN_CACHE_SIZE', 1024))
+
 
 class FirebaseAuthentication(authentication.BaseAuthentication):
     """Custom authentication using Firebase tokens"""
     
+    @timed('auth')
     def authenticate(self, request):
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
         
@@ -21,75 +27,36 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
         
         token = auth_header.split('Bearer ')[1]
         
+        decoded_token = token_cache.get(token)
+        if decoded_token is not None:
+            return (self._build_user(decoded_token), None)
+        
         try:
-            # Initialize Firebase Admin if not already initialized
-            if not firebase_admin._apps:
-                cred_path = settings.FIREBASE_CREDENTIALS_PATH
-                cred_initialized = False
-                
-                if cred_path:
-                    try:
-                        # Railway may provide credentials as:
-                        # 1. A JSON string in the environment variable
-                        # 2. A file path to a JSON file
-                        # 3. A dict (if parsed by Django settings)
-                        
-                        if isinstance(cred_path, dict):
-                            # Already a dict, use it directly
-                            cred = credentials.Certificate(cred_path)
-                            firebase_admin.initialize_app(cred, name='ndchancerecovery')
-                            cred_initialized = True
-                        elif isinstance(cred_path, str):
-                            # Check if it's a JSON string
-                            if cred_path.strip().startswith('{'):
-                                try:
-                                    cred_dict = json.loads(cred_path)
-                                    cred = credentials.Certificate(cred_dict)
-                                    firebase_admin.initialize_app(cred, name='ndchancerecovery')
-                                    cred_initialized = True
-                                except json.JSONDecodeError:
-                                    pass
-                            
-                            # If not JSON, try as file path
-                            if not cred_initialized and os.path.exists(cred_path):
-                                cred = credentials.Certificate(cred_path)
-                                firebase_admin.initialize_app(cred, name='ndchancerecovery')
-                                cred_initialized = True
-                    
-                    except Exception as e:
-                        logger.error(f"Error initializing Firebase with provided credentials: {e}", exc_info=True)
-                        cred_initialized = False
-                
-                # If we couldn't initialize with provided credentials, raise an error
-                # Don't fall back to default (Railway's) credentials
-                if not cred_initialized:
-                    raise Exception(
-                        f"Firebase credentials not properly configured. "
-                        f"FIREBASE_CREDENTIALS_PATH type: {type(cred_path)}, value: {str(cred_path)[:100] if cred_path else 'None'}. "
-                        f"Please ensure it contains valid Firebase credentials JSON for project 'ndchancerecovery'."
-                    )
-            
-            # Verify the token using the correct app instance
-            # Try to get the named app, fallback to default if it doesn't exist
-            try:
-                app = firebase_admin.get_app('ndchancerecovery')
-            except ValueError:
-                # Named app doesn't exist, use default
-                app = firebase_admin.get_app()
+            # Verify against locally held signing keys when a key provider is
+            # configured, so the request never waits on Google's certificate endpoint
+            provider = get_key_provider()
+            key_set = provider.get_key_set() if provider else None
+            if key_set is not None:
+                decoded_token = verify_id_token(token, key_set)
+                token_cache.set(token, decoded_token)
+                return (self._build_user(decoded_token), None)
             
+            # The app is initialized once per process by api.firebase
+            app = get_firebase_app()
             decoded_token = auth.verify_id_token(token, app=app)
-            uid = decoded_token['uid']
-            
-            # Return a user object with necessary attributes for Django REST Framework
-            # Create a simple object that mimics Django's User model
-            user = type('User', (), {
-                'uid': uid,
-                'email': decoded_token.get('email'),
-                'is_authenticated': True,
-                'is_active': True,
-                'is_anonymous': False,
-            })()
-            return (user, None)
+            token_cache.set(token, decoded_token)
+            return (self._build_user(decoded_token), None)
             
         except Exception as e:
             raise exceptions.AuthenticationFailed(f'Invalid token: {str(e)}')
+    
+    def _build_user(self, decoded_token):
+        # Return a user object with necessary attributes for Django REST Framework
+        # Create a simple object that mimics Django's User model
+        return type('User', (), {
+            'uid': decoded_token['uid'],
+            'email': decoded_token.get('email'),
+            'is_authenticated': True,
+            'is_active': True,
+            'is_anonymous': False,
+        })()
@@ -0,0 +1,159 @@
+"""
+Bulk create, update and delete for admin-managed content.
+
+BulkMixin adds a ``bulk/`` route to a ModelViewSet:
+
+* ``POST``   a list of objects to create them
+* ``PATCH``  a list of partial objects, each with its ``id``, to update them
+* ``DELETE`` ``{"ids": [...]}`` to delete them
+
+Every item is validated before anything is written. If any item fails, the
+response is 400 and lists each item with its errors, and nothing is changed.
+Otherwise all changes are applied with a single bulk_create, bulk_update or
+delete inside one transaction and each item's result is returned in order.
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .cache import bump_model_version
+
+
+class BulkMixin:
+    """Adds the ``bulk/`` route to a ModelViewSet"""
+
+    def clean_bulk_id(self, value):
+        """Primary key for a submitted id, or None if it is missing or malformed"""
+        if value is None or isinstance(value, (bool, dict, list)):
+            return None
+        try:
+            return self.get_queryset().model._meta.pk.to_python(value)
+        except ValidationError:
+            return None
+
+    def get_bulk_items(self, request):
+        """Return the list of items in the request body, or an error Response"""
+        items = request.data.get('ids') if request.method == 'DELETE' and isinstance(request.data, dict) else request.data
+        if not isinstance(items, list):
+            expected = '{"ids": [...]}' if request.method == 'DELETE' else 'a list of objects'
+            return Response({'detail': f'Expected {expected}.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.BULK_MAX_ITEMS:
+            return Response(
+                {'detail': f'At most {settings.BULK_MAX_ITEMS} items can be changed per request.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return items
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """Create, update or delete many objects in one transaction"""
+        items = self.get_bulk_items(request)
+        if isinstance(items, Response):
+            return items
+        if request.method == 'POST':
+            return self.bulk_create(items)
+        if request.method == 'PATCH':
+            return self.bulk_update(items)
+        return self.bulk_destroy(items)
+
+    def invalid_response(self, results):
+        for result in results:
+            result.setdefault('status', 'valid')
+        return Response({'results': results}, status=status.HTTP_400_BAD_REQUEST)
+
+    def bulk_create(self, items):
+        serializer_class = self.get_serializer_class()
+        serializers = [serializer_class(data=item, context=self.get_serializer_context()) for item in items]
+        results = [{'index': index} for index in range(len(items))]
+        valid = True
+        for result, serializer in zip(results, serializers):
+            if not serializer.is_valid():
+                result.update(status='invalid', errors=serializer.errors)
+                valid = False
+        if not valid:
+            return self.invalid_response(results)
+
+        model = self.get_queryset().model
+        with transaction.atomic():
+            objects = model.objects.bulk_create([model(**serializer.validated_data) for serializer in serializers])
+        # bulk_create sends no post_save, so invalidate cached lists here
+        bump_model_version(model)
+        for result, serializer, obj in zip(results, serializers, objects):
+            serializer.instance = obj
+            result.update(id=obj.pk, status='created', data=serializer.data)
+        return Response({'results': results}, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, items):
+        queryset = self.get_queryset()
+        ids = [self.clean_bulk_id(item.get('id')) if isinstance(item, dict) else None for item in items]
+        instances = queryset.in_bulk([pk for pk in ids if pk is not None])
+        serializer_class = self.get_serializer_class()
+        results = []
+        serializers = []
+        seen = set()
+        valid = True
+        for index, (pk, item) in enumerate(zip(ids, items)):
+            result = {'index': index, 'id': pk}
+            results.append(result)
+            if pk is None:
+                result.update(status='invalid', errors={'id': ['A valid id is required.']})
+                valid = False
+                continue
+            if pk not in instances:
+                result.update(status='not_found', errors={'id': ['Not found.']})
+                valid = False
+                continue
+            if pk in seen:
+                result.update(status='invalid', errors={'id': ['Duplicate id in request.']})
+                valid = False
+                continue
+            seen.add(pk)
+            serializer = serializer_class(instances[pk], data=item, partial=True, context=self.get_serializer_context())
+            if not serializer.is_valid():
+                result.update(status='invalid', errors=serializer.errors)
+                valid = False
+            serializers.append(serializer)
+        if not valid:
+            return self.invalid_response(results)
+
+        model = queryset.model
+        fields = set()
+        for serializer in serializers:
+            for attr, value in serializer.validated_data.items():
+                setattr(serializer.instance, attr, value)
+                fields.add(attr)
+        # bulk_update skips pre_save, so stamp auto_now fields ourselves
+        now = timezone.now()
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                for serializer in serializers:
+                    setattr(serializer.instance, field.attname, now)
+                fields.add(field.name)
+        if fields:
+            with transaction.atomic():
+                model.objects.bulk_update([serializer.instance for serializer in serializers], sorted(fields))
+            bump_model_version(model)
+        for result, serializer in zip(results, serializers):
+            result.update(status='updated', data=serializer.data)
+        return Response({'results': results})
+
+    def bulk_destroy(self, items):
+        queryset = self.get_queryset()
+        ids = [self.clean_bulk_id(value) for value in items]
+        found = set(queryset.filter(pk__in=[pk for pk in ids if pk is not None]).values_list('pk', flat=True))
+        results = [{'index': index, 'id': pk} for index, pk in enumerate(ids)]
+        missing = [result for result in results if result['id'] not in found]
+        if missing:
+            for result in missing:
+                result.update(status='not_found', errors={'id': ['Not found.']})
+            return self.invalid_response(results)
+
+        with transaction.atomic():
+            queryset.filter(pk__in=found).delete()
+        for result in results:
+            result['status'] = 'deleted'
+        return Response({'results': results})
@@ -0,0 +1,128 @@
+"""
+Response cache for public read endpoints.
+
+Each cached response is keyed by the request URL plus a version number for
+every model it was built from. Saving or deleting one of those models bumps
+its version (see api.signals), so only the endpoints that depend on it miss
+on their next request.
+
+Versions are only bumped in the cache of the process that wrote, so with a
+per-process backend (LocMem, the default without REDIS_URL) responses are
+not cached at all: writes by other web workers, process_submissions or
+import_content would stay invisible until the entry expired.
+"""
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.dispatch import Signal
+from rest_framework.response import Response
+
+VERSION_KEY_PREFIX = 'api:version:'
+RESPONSE_KEY_PREFIX = 'api:response:'
+
+# Backends that never wait on I/O, where the async cache methods would only
+# add a hop to a worker thread
+IN_PROCESS_BACKENDS = (LocMemCache, DummyCache)
+
+# Sent with the model as sender whenever its version is bumped, which covers
+# saves, deletes, bulk writes and imports (see api.snapshots)
+model_version_bumped = Signal()
+
+
+def _version_key(model):
+    return f'{VERSION_KEY_PREFIX}{model._meta.label_lower}'
+
+
+def _new_version():
+    # Start from the clock so a version key that was evicted never comes back
+    # with a number an older cached response was stored under
+    return int(time.time() * 1000)
+
+
+def get_model_versions(models):
+    """Return the current version of each model, initializing missing ones"""
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        for key, value in missing.items():
+            if not cache.add(key, value, None):
+                missing[key] = cache.get(key, value)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def shared_cache():
+    """Whether the default cache is shared between processes, so versions bumped elsewhere are seen"""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], IN_PROCESS_BACKENDS)
+
+
+async def acache(method, *args):
+    """Call ``cache.<method>`` from the event loop without blocking it"""
+    if not shared_cache():
+        return getattr(cache, method)(*args)
+    return await getattr(cache, f'a{method}')(*args)
+
+
+async def aget_model_versions(models):
+    """Async get_model_versions() for views running on the event loop"""
+    keys = [_version_key(model) for model in models]
+    versions = await acache('get_many', keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        for key, value in missing.items():
+            if not await acache('add', key, value, None):
+                missing[key] = await acache('get', key, value)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """Invalidate every cached response built from this model"""
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
+    model_version_bumped.send(sender=model)
+
+
+def response_cache_key(request, models, versions=None):
+    if versions is None:
+        versions = get_model_versions(models)
+    return f"{RESPONSE_KEY_PREFIX}{'.'.join(str(version) for version in versions)}:{request.build_absolute_uri()}"
+
+
+async def aresponse_cache_key(request, models):
+    return response_cache_key(request, models, await aget_model_versions(models))
+
+
+def cache_public_response(*models, timeout=None):
+    """Cache an anonymous GET response until one of ``models`` changes.
+
+    Authenticated requests bypass the cache because several viewsets return
+    a wider queryset to admins, and nothing is cached unless the cache is
+    shared between processes.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != 'GET' or (hasattr(request.user, 'is_authenticated') and request.user.is_authenticated):
+                return view_method(self, request, *args, **kwargs)
+            if not shared_cache():
+                return view_method(self, request, *args, **kwargs)
+            key = response_cache_key(request, models)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache_timeout = timeout if timeout is not None else settings.PUBLIC_CACHE_TIMEOUT
+                cache.set(key, response.data, cache_timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,132 @@
+"""
+Conditional GET support for API viewsets.
+
+ConditionalGetMixin fingerprints the queryset behind a GET request (newest
+timestamp plus row count, together with the model version kept by
+api.signals) and emits it as ETag/Last-Modified. Requests carrying a
+matching If-None-Match/If-Modified-Since are answered with 304 before the
+view runs, so nothing is serialized.
+
+With a shared cache the validators are cached under the model version. A
+per-process cache never sees versions bumped by other processes, so there
+they are recomputed on every request, from the rows themselves.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import acache, aget_model_versions, get_model_versions, shared_cache
+
+VALIDATORS_KEY_PREFIX = 'api:validators:'
+
+
+class NotModified(Exception):
+    """Raised from initial() to skip the handler and answer 304"""
+
+    def __init__(self, response):
+        self.response = response
+
+
+def validator_aggregates(timestamp_field):
+    aggregates = {'count': Count('pk')}
+    if timestamp_field:
+        aggregates['latest'] = Max(timestamp_field)
+    return aggregates
+
+
+def validator_scope(version, authenticated, request):
+    return f'{version}:{authenticated}:{request.build_absolute_uri()}'
+
+
+def validators_from(result, scope):
+    """(etag, last_modified) from the validator_aggregates() of a queryset"""
+    latest = result.get('latest')
+    fingerprint = f"{scope}|{result['count']}|{latest.isoformat() if latest else ''}"
+    etag = quote_etag(hashlib.md5(fingerprint.encode('utf-8'), usedforsecurity=False).hexdigest())
+    last_modified = int(latest.timestamp()) if latest else None
+    return etag, last_modified
+
+
+async def aget_anonymous_validators(request, queryset, timestamp_field):
+    """ConditionalGetMixin.get_validators() for an anonymous request, on the event loop"""
+    version = (await aget_model_versions([queryset.model]))[0]
+    scope = validator_scope(version, False, request)
+    key = f'{VALIDATORS_KEY_PREFIX}{scope}'
+    shared = shared_cache()
+    validators = await acache('get', key) if shared else None
+    if validators is None:
+        result = await queryset.order_by().aaggregate(**validator_aggregates(timestamp_field))
+        validators = validators_from(result, scope)
+        if shared:
+            await acache('set', key, validators, settings.PUBLIC_CACHE_TIMEOUT)
+    return validators
+
+
+class ConditionalGetMixin:
+    """Emit ETag/Last-Modified on GET and answer matching requests with 304"""
+    # Field whose newest value marks when the collection last changed;
+    # None fingerprints by row count and model version only
+    timestamp_field = 'updated_at'
+
+    def get_validator_queryset(self):
+        queryset = self.get_queryset()
+        if self.detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def compute_validators(self, queryset, scope):
+        """Return (etag, last_modified) for a queryset with one aggregate query"""
+        result = queryset.order_by().aggregate(**validator_aggregates(self.timestamp_field))
+        return validators_from(result, scope)
+
+    def get_validators(self):
+        # Validators only change when the model version does, so with a shared
+        # cache they are cached under it and repeat requests skip the aggregate
+        # query. A per-process cache misses other processes' writes.
+        queryset = self.get_validator_queryset()
+        user = self.request.user
+        authenticated = hasattr(user, 'is_authenticated') and user.is_authenticated
+        version = get_model_versions([queryset.model])[0]
+        scope = validator_scope(version, authenticated, self.request)
+        if not shared_cache():
+            return self.compute_validators(queryset, scope)
+        key = f'{VALIDATORS_KEY_PREFIX}{scope}'
+        validators = cache.get(key)
+        if validators is None:
+            validators = self.compute_validators(queryset, scope)
+            cache.set(key, validators, settings.PUBLIC_CACHE_TIMEOUT)
+        return validators
+
+    def set_validator_headers(self, response):
+        etag, last_modified = self._validators
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Runs after authentication and permission checks
+        self._validators = None
+        if request.method in ('GET', 'HEAD'):
+            self._validators = self.get_validators()
+            etag, last_modified = self._validators
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            self.set_validator_headers(exc.response)
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, '_validators', None) and response.status_code == 200:
+            self.set_validator_headers(response)
+        return response
@@ -0,0 +1,163 @@
+"""
+Read-only serialization straight from ``.values()`` rows.
+
+DRF's ModelSerializer walks every field of every instance through
+get_attribute/to_representation, which dominates CPU time on the public
+lists. ValuesSerializer inspects a ModelSerializer once, compiles a
+converter per field, and then turns ``.values()`` rows into dicts that
+render to exactly the same JSON as the DRF serializer.
+"""
+from functools import lru_cache
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from .images import SrcsetField, srcset
+
+# DRF fields whose representation is the database value unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField, serializers.CharField, serializers.IntegerField,
+    serializers.JSONField, serializers.ModelField,
+)
+
+
+class UnsupportedSerializer(Exception):
+    pass
+
+
+def _field_representation(field):
+    def convert(value, context):
+        return field.to_representation(value) if value is not None else None
+    return convert
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601 or hasattr(field, 'timezone'):
+        return _field_representation(field)
+
+    def convert(value, context):
+        if not value:
+            return None
+        # Same as DateTimeField.enforce_timezone for aware values in the
+        # active timezone, followed by its ISO 8601 formatting
+        if context['timezone'] is not None and timezone.is_aware(value):
+            value = value.astimezone(context['timezone'])
+        else:
+            value = field.enforce_timezone(value)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _file_converter(field, model_field):
+    storage = model_field.storage
+
+    def convert(value, context):
+        if not value:
+            return None
+        if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            return value
+        url = storage.url(value)
+        request = context['request']
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    return convert
+
+
+def _passthrough(value, context):
+    return value
+
+
+class ValuesSerializer:
+    """Compiled, read-only equivalent of a DRF ModelSerializer"""
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        if serializer_class.to_representation is not serializers.ModelSerializer.to_representation:
+            raise UnsupportedSerializer(f'{serializer_class.__name__} customizes to_representation')
+        meta = serializer_class.Meta
+        self.model = meta.model
+        self.columns = list(getattr(meta, 'load_fields', meta.fields))
+        self._serializer = serializer_class()
+        self.converters = []
+        for name, field in self._serializer.fields.items():
+            if field.write_only:
+                continue
+            self.converters.append((name, *self._compile(name, field)))
+
+    def _compile(self, name, field):
+        """Return (source, converter); a None source hands the whole row to the converter"""
+        if isinstance(field, serializers.SerializerMethodField):
+            method = getattr(self._serializer, field.method_name)
+            return None, lambda row, context: method(SimpleNamespace(**row))
+        source = field.source
+        if '.' in source or source == '*' or isinstance(field, (serializers.BaseSerializer, serializers.RelatedField)):
+            raise UnsupportedSerializer(f'{self.serializer_class.__name__}.{name} reads a related object')
+        if source not in self.columns:
+            raise UnsupportedSerializer(f'{self.serializer_class.__name__}.{name} is not a loaded column')
+        if isinstance(field, SrcsetField):
+            return source, lambda value, context: srcset(value, context['request'])
+        if isinstance(field, serializers.DateTimeField):
+            return source, _datetime_converter(field)
+        if isinstance(field, serializers.FileField):
+            return source, _file_converter(field, self.model._meta.get_field(source))
+        if isinstance(field, serializers.DecimalField):
+            return source, _field_representation(field)
+        if isinstance(field, PASSTHROUGH_FIELDS):
+            return source, _passthrough
+        raise UnsupportedSerializer(f'{self.serializer_class.__name__}.{name} has unsupported type {type(field).__name__}')
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def serialize(self, rows, request=None):
+        """Convert ``.values()`` rows (or a queryset) into response dicts"""
+        if isinstance(rows, QuerySet):
+            rows = self.values(rows)
+        context = {
+            'request': request,
+            'timezone': timezone.get_current_timezone() if settings.USE_TZ else None,
+        }
+        converters = self.converters
+        data = []
+        for row in rows:
+            item = {}
+            for name, source, convert in converters:
+                if source is None:
+                    item[name] = convert(row, context)
+                else:
+                    item[name] = convert(row[source], context)
+            data.append(item)
+        return data
+
+
+@lru_cache(maxsize=None)
+def get_values_serializer(serializer_class):
+    """Compiled ValuesSerializer for a serializer class, or None if it can't be compiled"""
+    try:
+        return ValuesSerializer(serializer_class)
+    except UnsupportedSerializer:
+        return None
+
+
+class ValuesListMixin:
+    """Serve list() through a ValuesSerializer when the view's serializer compiles to one"""
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = get_values_serializer(self.get_serializer_class())
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = values_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page, request))
+        return Response(values_serializer.serialize(queryset, request))
@@ -0,0 +1,153 @@
+"""
+Once-per-process Firebase Admin initialization.
+
+Credential parsing runs from ApiConfig.ready() (and optionally again from
+wsgi.py/asgi.py at worker boot), so FirebaseAuthentication only has to read
+an attribute on the request path. A failed initialization is retried by
+later requests, after FIREBASE_INIT_RETRY_DELAY seconds doubling up to
+FIREBASE_INIT_RETRY_MAX_DELAY, so a transient credentials or network
+problem doesn't disable authentication until the process restarts.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+import firebase_admin
+from firebase_admin import credentials
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+FIREBASE_APP_NAME = 'ndchancerecovery'
+
+
+class FirebaseNotConfigured(Exception):
+    pass
+
+
+def _load_certificate(cred_path):
+    """Build a credentials.Certificate from FIREBASE_CREDENTIALS_PATH"""
+    # Railway may provide credentials as:
+    # 1. A JSON string in the environment variable
+    # 2. A file path to a JSON file
+    # 3. A dict (if parsed by Django settings)
+    if isinstance(cred_path, dict):
+        return credentials.Certificate(cred_path)
+    if isinstance(cred_path, str):
+        if cred_path.strip().startswith('{'):
+            try:
+                return credentials.Certificate(json.loads(cred_path))
+            except json.JSONDecodeError:
+                pass
+        if os.path.exists(cred_path):
+            return credentials.Certificate(cred_path)
+    return None
+
+
+class FirebaseBootstrap:
+    """Initializes the Firebase app once, retrying failures with backoff, and records how it went"""
+
+    def __init__(self):
+        self.app = None
+        self.error = None
+        self.init_seconds = None
+        self.initialized_at = None
+        self.attempted = False
+        self.failures = 0
+        self.retry_at = None
+        self._lock = threading.Lock()
+
+    def _settled(self):
+        """Whether the stored result stands: initialized, or failed and not yet due a retry"""
+        if not self.attempted or self.app is not None:
+            return self.attempted
+        return time.monotonic() < self.retry_at
+
+    def initialize(self, force=False):
+        """Initialize the Firebase app; later calls return the stored result until a retry is due"""
+        if not force and self._settled():
+            return self.app
+        with self._lock:
+            if not force and self._settled():
+                return self.app
+            started = time.perf_counter()
+            try:
+                self.app = self._get_or_create_app()
+                self.error = None
+            except FirebaseNotConfigured as e:
+                logger.warning(str(e))
+                self.app = None
+                self.error = str(e)
+            except Exception as e:
+                logger.error(f"Error initializing Firebase with provided credentials: {e}", exc_info=True)
+                self.app = None
+                self.error = str(e)
+            self.init_seconds = time.perf_counter() - started
+            self.initialized_at = time.time()
+            self.attempted = True
+            if self.app is None:
+                delay = min(
+                    settings.FIREBASE_INIT_RETRY_DELAY * 2 ** self.failures,
+                    settings.FIREBASE_INIT_RETRY_MAX_DELAY,
+                )
+                self.failures += 1
+                self.retry_at = time.monotonic() + delay
+            else:
+                self.failures = 0
+                self.retry_at = None
+        return self.app
+
+    def _get_or_create_app(self):
+        try:
+            return firebase_admin.get_app(FIREBASE_APP_NAME)
+        except ValueError:
+            # Named app doesn't exist; reuse the default app if one was set up elsewhere
+            if firebase_admin._apps:
+                return firebase_admin.get_app()
+        cred_path = settings.FIREBASE_CREDENTIALS_PATH
+        cred = _load_certificate(cred_path) if cred_path else None
+        # Don't fall back to default (Railway's) credentials
+        if cred is None:
+            raise FirebaseNotConfigured(
+                f"Firebase credentials not properly configured. "
+                f"FIREBASE_CREDENTIALS_PATH type: {type(cred_path).__name__}, set: {bool(cred_path)}. "
+                f"Please ensure it contains valid Firebase credentials JSON for project '{FIREBASE_APP_NAME}'."
+            )
+        return firebase_admin.initialize_app(cred, name=FIREBASE_APP_NAME)
+
+    def status(self):
+        return {
+            'initialized': self.app is not None,
+            'attempted': self.attempted,
+            'init_ms': round(self.init_seconds * 1000, 2) if self.init_seconds is not None else None,
+            'initialized_at': self.initialized_at,
+            'error': self.error,
+            'failures': self.failures,
+            'retry_in': round(max(self.retry_at - time.monotonic(), 0), 1) if self.retry_at is not None else None,
+        }
+
+
+bootstrap = FirebaseBootstrap()
+
+
+def get_firebase_app():
+    """Return the initialized Firebase app, raising if initialization failed"""
+    app = bootstrap.app if bootstrap.app is not None else bootstrap.initialize()
+    if app is None:
+        raise FirebaseNotConfigured(bootstrap.error)
+    return app
+
+
+def warm_up():
+    """Called at worker boot: initialize Firebase and load signing keys"""
+    from .keys import get_key_provider
+
+    bootstrap.initialize()
+    try:
+        provider = get_key_provider()
+        if provider is not None:
+            provider.get_key_set()
+    except Exception as e:
+        logger.warning(f"Could not load Firebase signing keys at boot: {e}")
@@ -0,0 +1,197 @@
+"""
+Responsive derivatives of uploaded images.
+
+When SiteSettings.background_image, Program.image or Housing.image is saved
+with a new file, a background thread writes resized WebP/JPEG copies at
+settings.IMAGE_DERIVATIVE_WIDTHS through the default storage (local or S3)
+and records them in the model's ``<field>_derivatives`` JSON column:
+
+    {"source": "programs/photo.jpg",
+     "webp": {"480": "derivatives/programs/photo-480w.webp", ...},
+     "jpeg": {"480": "derivatives/programs/photo-480w.jpg", ...}}
+
+SrcsetField turns that map into srcset strings for the API serializers.
+"""
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .cache import bump_model_version
+from .models import SiteSettings, Program, Housing
+
+# Pillow is in requirements.txt, but keep the API importable without it
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Models and the image field that gets derivatives
+IMAGE_FIELDS = (
+    (SiteSettings, 'background_image'),
+    (Program, 'image'),
+    (Housing, 'image'),
+)
+
+FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-derivatives')
+
+
+def derivatives_field(field_name):
+    return f'{field_name}_derivatives'
+
+
+def available_formats():
+    formats = []
+    for name in settings.IMAGE_DERIVATIVE_FORMATS:
+        if name not in FORMATS:
+            raise ValueError(f"IMAGE_DERIVATIVE_FORMATS entries must be one of {', '.join(FORMATS)}, not {name!r}")
+        if name == 'webp' and not features.check('webp'):
+            logger.warning('Pillow was built without WebP support; skipping WebP derivatives')
+            continue
+        formats.append(name)
+    return formats
+
+
+def render(image, width, fmt):
+    """Encode ``image`` scaled down to ``width`` pixels wide"""
+    pil_format, _ = FORMATS[fmt]
+    resized = image.copy()
+    resized.thumbnail((width, image.height), Image.LANCZOS)
+    if pil_format == 'JPEG' and resized.mode != 'RGB':
+        resized = resized.convert('RGB')
+    elif resized.mode not in ('RGB', 'RGBA'):
+        resized = resized.convert('RGBA' if 'A' in resized.getbands() else 'RGB')
+    buffer = io.BytesIO()
+    resized.save(buffer, pil_format, quality=settings.IMAGE_DERIVATIVE_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def build_derivatives(name):
+    """Write the derivatives of the stored image ``name`` and return their map"""
+    with default_storage.open(name, 'rb') as f:
+        image = Image.open(f)
+        # Bake in the camera rotation, which derivatives would otherwise lose
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    # Never upscale: widths past the original collapse to the original width
+    widths = sorted({min(width, image.width) for width in settings.IMAGE_DERIVATIVE_WIDTHS})
+    root, _ = os.path.splitext(name)
+    derivatives = {'source': name}
+    for fmt in available_formats():
+        _, extension = FORMATS[fmt]
+        derivatives[fmt] = {}
+        for width in widths:
+            path = default_storage.save(f'derivatives/{root}-{width}w.{extension}', ContentFile(render(image, width, fmt)))
+            derivatives[fmt][str(width)] = path
+    return derivatives
+
+
+def stored_paths(derivatives):
+    return [path for fmt in FORMATS for path in (derivatives or {}).get(fmt, {}).values()]
+
+
+def delete_files(paths):
+    for path in paths:
+        try:
+            default_storage.delete(path)
+        except Exception as e:
+            logger.warning(f"Could not delete image derivative {path}: {e}")
+
+
+def generate_derivatives(model, pk, field_name, force=False):
+    """Bring the derivatives of one row's image up to date; returns True if it changed"""
+    column = derivatives_field(field_name)
+    row = model.objects.filter(pk=pk).values(field_name, column).first()
+    if row is None:
+        return False
+    name, current = row[field_name] or '', row[column] or {}
+    if current.get('source', '') == name and not force:
+        return False
+    derivatives = build_derivatives(name) if name else {}
+    # Only store the result if the image wasn't replaced while we worked
+    # update() skips auto_now, and SiteSettings.load() watches updated_at
+    updated = model.objects.filter(pk=pk, **{field_name: row[field_name]}).update(
+        **{column: derivatives, 'updated_at': timezone.now()}
+    )
+    if not updated:
+        delete_files(stored_paths(derivatives))
+        return False
+    delete_files(set(stored_paths(current)) - set(stored_paths(derivatives)))
+    # update() sends no post_save, so invalidate cached responses here
+    bump_model_version(model)
+    return True
+
+
+def _generate(model, pk, field_name):
+    try:
+        generate_derivatives(model, pk, field_name)
+    except Exception as e:
+        logger.error(f"Generating derivatives for {model.__name__} #{pk} failed: {e}", exc_info=True)
+
+
+def _run_in_background(model, pk, field_name):
+    # The executor thread has its own database connection to look after
+    close_old_connections()
+    try:
+        _generate(model, pk, field_name)
+    finally:
+        close_old_connections()
+
+
+def schedule_derivatives(sender, instance, raw=False, **kwargs):
+    """post_save receiver queueing derivative generation when the image changed"""
+    if raw or Image is None:
+        return
+    for model, field_name in IMAGE_FIELDS:
+        if sender is not model:
+            continue
+        name = getattr(instance, field_name).name or ''
+        if getattr(instance, derivatives_field(field_name)).get('source', '') == name:
+            continue
+        if settings.IMAGE_DERIVATIVES_ASYNC:
+            transaction.on_commit(partial(_executor.submit, _run_in_background, model, instance.pk, field_name))
+        else:
+            transaction.on_commit(partial(_generate, model, instance.pk, field_name))
+
+
+def srcset(derivatives, request=None):
+    """{'webp': 'url 480w, url 960w', 'jpeg': ...} for a derivatives map"""
+    result = {}
+    for fmt in FORMATS:
+        variants = (derivatives or {}).get(fmt)
+        if not variants:
+            continue
+        entries = []
+        for width, path in sorted(variants.items(), key=lambda item: int(item[0])):
+            url = default_storage.url(path)
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            entries.append(f'{url} {width}w')
+        result[fmt] = ', '.join(entries)
+    return result
+
+
+class SrcsetField(serializers.Field):
+    """Read-only srcset strings per format, built from a ``*_derivatives`` column"""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return srcset(value, self.context.get('request'))
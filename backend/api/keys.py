@@ -0,0 +1,241 @@
+"""
+Signing-key providers for verifying Firebase ID tokens without per-request
+network I/O.
+
+Google rotates the certificates used to sign Firebase ID tokens and publishes
+them at GOOGLE_CERTS_URL. firebase_admin fetches them lazily inside
+verify_id_token, so a cold worker stalls on that fetch for its first
+authenticated request. The providers here hold the certificates locally (a
+file, the shared Django cache or a fixed stand-in set) and a background
+refresher keeps them current before they expire.
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.request
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from google.auth import jwt
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = 'https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com'
+DEFAULT_MAX_AGE = 3600
+
+
+class KeySet:
+    """Signing certificates keyed by key id, plus when they stop being valid"""
+
+    def __init__(self, keys, expires_at=float('inf')):
+        self.keys = keys
+        self.expires_at = expires_at
+
+    def is_expired(self, now=None):
+        return (now or time.time()) >= self.expires_at
+
+    def expires_within(self, seconds, now=None):
+        return (now or time.time()) + seconds >= self.expires_at
+
+    def to_dict(self):
+        return {'keys': self.keys, 'expires_at': self.expires_at}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(keys=dict(data['keys']), expires_at=float(data['expires_at']))
+
+
+def fetch_google_certificates(url=GOOGLE_CERTS_URL, timeout=10):
+    """Download the current signing certificates. Only called off the request path."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        keys = json.loads(response.read().decode('utf-8'))
+        cache_control = response.headers.get('Cache-Control', '')
+    match = re.search(r'max-age=(\d+)', cache_control)
+    max_age = int(match.group(1)) if match else DEFAULT_MAX_AGE
+    return KeySet(keys=keys, expires_at=time.time() + max_age)
+
+
+class KeyProvider:
+    """Base class for signing-key providers.
+
+    get_key_set() is called on the request path and must never hit the
+    network. It returns None when no usable keys are held.
+    """
+    # Whether a background refresher should keep this provider current
+    refreshable = True
+
+    def get_key_set(self):
+        raise NotImplementedError
+
+    def store(self, key_set):
+        raise NotImplementedError
+
+
+class StaticKeyProvider(KeyProvider):
+    """Fixed key set, e.g. a locally generated stand-in for tests"""
+    refreshable = False
+
+    def __init__(self, keys=None):
+        if keys is None:
+            keys = getattr(settings, 'FIREBASE_STATIC_KEYS', {})
+        self._key_set = KeySet(keys=dict(keys))
+
+    def get_key_set(self):
+        return self._key_set if self._key_set.keys else None
+
+    def store(self, key_set):
+        self._key_set = key_set
+
+
+class FileKeyProvider(KeyProvider):
+    """Keys stored in a JSON file shared by every worker on the host"""
+
+    def __init__(self, path=None):
+        self.path = path or settings.FIREBASE_KEYS_FILE
+        self._key_set = None
+        self._mtime = None
+
+    def get_key_set(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return None
+        if mtime != self._mtime:
+            try:
+                with open(self.path) as f:
+                    self._key_set = KeySet.from_dict(json.load(f))
+                self._mtime = mtime
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not read Firebase keys from {self.path}: {e}")
+                return None
+        if self._key_set is None or self._key_set.is_expired():
+            return None
+        return self._key_set
+
+    def store(self, key_set):
+        # Write to a temp file and rename so readers never see a partial file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(key_set.to_dict(), f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._key_set = key_set
+
+
+class CacheKeyProvider(KeyProvider):
+    """Keys stored in the Django cache, shared by every worker using it"""
+    cache_key = 'firebase:signing-keys'
+
+    def __init__(self):
+        self._key_set = None
+
+    def get_key_set(self):
+        # Memoize in-process until expiry so the cache is only read on rotation
+        if self._key_set is not None and not self._key_set.is_expired():
+            return self._key_set
+        data = cache.get(self.cache_key)
+        if not data:
+            return None
+        key_set = KeySet.from_dict(data)
+        if key_set.is_expired():
+            return None
+        self._key_set = key_set
+        return key_set
+
+    def store(self, key_set):
+        timeout = max(int(key_set.expires_at - time.time()), 1)
+        cache.set(self.cache_key, key_set.to_dict(), timeout)
+        self._key_set = key_set
+
+
+class KeyRefresher:
+    """Daemon thread that re-fetches keys before the provider's copy expires"""
+
+    def __init__(self, provider, margin=None, fetch=fetch_google_certificates):
+        self.provider = provider
+        self.margin = margin if margin is not None else getattr(settings, 'FIREBASE_KEYS_REFRESH_MARGIN', 300)
+        self.fetch = fetch
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Fetch and store new keys if the current ones are missing or about to expire"""
+        key_set = self.provider.get_key_set()
+        if not force and key_set is not None and not key_set.expires_within(self.margin):
+            return key_set
+        key_set = self.fetch()
+        self.provider.store(key_set)
+        logger.info(f"Refreshed Firebase signing keys ({len(key_set.keys)} keys)")
+        return key_set
+
+    def _run(self):
+        while True:
+            try:
+                key_set = self.refresh()
+                delay = key_set.expires_at - time.time() - self.margin
+            except Exception as e:
+                logger.warning(f"Firebase signing key refresh failed: {e}")
+                delay = 60
+            time.sleep(min(max(delay, 30), DEFAULT_MAX_AGE))
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='firebase-key-refresher', daemon=True)
+                self._thread.start()
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_key_provider():
+    """Return the configured provider, or None to let firebase_admin fetch keys itself"""
+    global _provider
+    if _provider is None and settings.FIREBASE_KEY_PROVIDER:
+        with _provider_lock:
+            if _provider is None:
+                provider = import_string(settings.FIREBASE_KEY_PROVIDER)()
+                if provider.refreshable:
+                    KeyRefresher(provider).start()
+                _provider = provider
+    return _provider
+
+
+def set_key_provider(provider):
+    """Install a provider directly, e.g. a StaticKeyProvider in tests"""
+    global _provider
+    _provider = provider
+
+
+def verify_id_token(token, key_set, project_id=None):
+    """Verify a Firebase ID token against locally held certificates.
+
+    Performs the same checks as firebase_admin.auth.verify_id_token and
+    returns the decoded claims with ``uid`` set.
+    """
+    project_id = project_id or settings.FIREBASE_PROJECT_ID
+    header = jwt.decode_header(token)
+    if header.get('alg') != 'RS256':
+        raise ValueError(f"Firebase ID token has incorrect algorithm: {header.get('alg')}")
+    if header.get('kid') not in key_set.keys:
+        raise ValueError('Firebase ID token has unknown key id')
+    claims = jwt.decode(token, certs=key_set.keys, audience=project_id)
+    if claims.get('iss') != f'https://securetoken.google.com/{project_id}':
+        raise ValueError('Firebase ID token has incorrect issuer')
+    subject = claims.get('sub')
+    if not isinstance(subject, str) or not subject or len(subject) > 128:
+        raise ValueError('Firebase ID token has invalid subject')
+    claims['uid'] = subject
+    return claims
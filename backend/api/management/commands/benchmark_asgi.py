@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api.async_views import PUBLIC_ENDPOINTS
+from api.management.commands.benchmark_endpoints import percentile
+
+# name -> (executable, arguments after the bind options, extra environment)
+SERVERS = {
+    # The Procfile's web process
+    'wsgi': ('gunicorn', ['recovery_center.wsgi:application'], {}),
+    # ASGI with the DRF views, which Django runs through sync_to_async
+    'asgi-sync': ('uvicorn', ['recovery_center.asgi:application'], {'ASYNC_PUBLIC_VIEWS': 'False', 'DB_CONN_MAX_AGE': '0'}),
+    # ASGI with the native async views in api.async_views
+    'asgi': ('uvicorn', ['recovery_center.asgi:application'], {'ASYNC_PUBLIC_VIEWS': 'True', 'DB_CONN_MAX_AGE': '0'}),
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def fetch(port, path):
+    """GET ``path`` on a fresh connection; returns (status, seconds)"""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: application/json\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+    return int(status_line.split()[1]), time.perf_counter() - started
+
+
+async def load(port, paths, requests, concurrency):
+    """Send ``requests`` GETs cycling through ``paths``, ``concurrency`` at a time"""
+    queue = iter(range(requests))
+    samples = []
+
+    async def client():
+        for index in queue:
+            try:
+                samples.append(await asyncio.wait_for(fetch(port, paths[index % len(paths)]), 30))
+            except (OSError, ValueError, IndexError, asyncio.TimeoutError):
+                samples.append((None, None))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = ('Compare the public read endpoints under the WSGI deployment (gunicorn, as in the Procfile), '
+            'uvicorn with the DRF views and uvicorn with the native async views, at increasing concurrency. '
+            'The servers use the configured database and cache, so point them at seeded data '
+            '(--database-url) and never at production.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', default=','.join(SERVERS), help=f"Comma-separated, from {', '.join(SERVERS)}")
+        parser.add_argument('--concurrency', default='1,10,50,100', help='Comma-separated concurrency levels')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per server and concurrency level')
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes per server')
+        parser.add_argument('--path', action='append', default=[], metavar='PATH',
+                            help='Path to request (repeatable); defaults to every endpoint in api.async_views')
+        parser.add_argument('--database-url', help='DATABASE_URL for the servers')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        servers = [name.strip() for name in options['servers'].split(',') if name.strip()]
+        for name in servers:
+            if name not in SERVERS:
+                raise CommandError(f"Unknown server {name!r}; choose from {', '.join(SERVERS)}")
+            executable = SERVERS[name][0]
+            if shutil.which(executable) is None:
+                raise CommandError(f'{executable} is not installed (pip install {executable})')
+        levels = [int(level) for level in options['concurrency'].split(',')]
+        paths = options['path'] or [f'/api/{route}' for route, _, _ in PUBLIC_ENDPOINTS]
+
+        results = {}
+        for name in servers:
+            port = free_port()
+            process = self.start(name, port, options)
+            try:
+                self.wait_until_ready(process, port)
+                # Fill the response cache and open database connections first
+                asyncio.run(load(port, paths, len(paths) * 5, 1))
+                for level in levels:
+                    samples, wall = asyncio.run(load(port, paths, options['requests'], level))
+                    latencies = sorted(elapsed * 1000 for status, elapsed in samples if status is not None)
+                    result = {
+                        'throughput_rps': round(len(latencies) / wall, 1),
+                        'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+                        'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+                        'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+                        'errors': sum(1 for status, _ in samples if status is None or status >= 400),
+                    }
+                    results[f'{name} c={level}'] = result
+                    self.stdout.write(
+                        f"{name:<10} concurrency {level:>4}  {result['throughput_rps']:8.1f} req/s  "
+                        f"p50 {result['p50_ms']}  p95 {result['p95_ms']}  p99 {result['p99_ms']} ms  "
+                        f"{result['errors']} errors"
+                    )
+            finally:
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'paths': paths, 'workers': options['workers'], 'results': results}, f, indent=2, sort_keys=True)
+                f.write('\n')
+
+    def start(self, name, port, options):
+        executable, arguments, extra_env = SERVERS[name]
+        env = {**os.environ, **extra_env, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'recovery_center.settings')}
+        if options['database_url']:
+            env['DATABASE_URL'] = options['database_url']
+        if executable == 'gunicorn':
+            command = ['gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(options['workers']), *arguments]
+        else:
+            command = ['uvicorn', '--host', '127.0.0.1', '--port', str(port), '--workers', str(options['workers']),
+                       '--no-access-log', *arguments]
+        return subprocess.Popen(command, cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=sys.stderr)
+
+    def wait_until_ready(self, process, port, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server exited with status {process.returncode}')
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'Server did not start within {timeout} s')
@@ -0,0 +1,374 @@
+import http.client
+import json
+import logging
+import math
+import os
+import platform
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases
+from api.cache import bump_model_version
+from api.management.seed import seed_bulk
+from api.token_cache import VerifiedTokenCache
+from api.urls import router
+
+# Rows seeded per model, in creation order (applications point at housing)
+DEFAULT_VOLUMES = {
+    'SiteSettings': 1,
+    'ContactForm': 100000,
+    'Review': 10000,
+    'Program': 50,
+    'Housing': 50,
+    'AmazonWishList': 20,
+    'Donor': 50000,
+    'HousingApplication': 10000,
+    'QueuedSubmission': 1000,
+}
+
+# Bearer token that the stubbed Firebase token cache accepts
+ADMIN_TOKEN = 'benchmark-admin-token'
+
+SERVER_TIMING_QUERIES_RE = re.compile(r'\bdb;[^,]*desc="(\d+) queries"')
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class BenchmarkServer(ThreadedWSGIServer):
+    request_queue_size = 128
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)]
+
+
+def queries_from(server_timing):
+    """Query count reported by PerformanceMiddleware; Server-Timing has no db entry when there were none"""
+    if server_timing is None:
+        return None
+    match = SERVER_TIMING_QUERIES_RE.search(server_timing)
+    return int(match.group(1)) if match else 0
+
+
+class Command(BaseCommand):
+    help = ('Seed the test database with realistic volumes of every api model, then time GET requests to '
+            'every API, project and Django admin route through the test client and a local threaded WSGI '
+            'server. Reports p50/p95/p99 latency, throughput and query counts, and writes them to a JSON '
+            'baseline that later runs can --compare against. Firebase auth is stubbed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--volume', action='append', default=[], metavar='MODEL=ROWS',
+                            help='Rows to seed for a model, e.g. --volume Donor=50000 (repeatable)')
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiply every volume, e.g. 0.01 for a quick run')
+        parser.add_argument('--requests', type=int, default=100, help='Timed requests per endpoint and user')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per endpoint and user')
+        parser.add_argument('--concurrency', type=int, default=4, help='Requests in flight at once')
+        parser.add_argument('--transport', choices=['client', 'server', 'both'], default='both')
+        parser.add_argument('--endpoint', action='append', default=[], metavar='TEXT',
+                            help='Only run endpoints whose path or name contains TEXT (repeatable)')
+        parser.add_argument('--path', action='append', default=[], metavar='PATH',
+                            help='Extra path to benchmark, e.g. "/api/donors/?page_size=50" (repeatable)')
+        parser.add_argument('--no-cache', action='store_true', help='Use the dummy cache so no response is cached')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the test database between runs and only seed missing rows')
+        parser.add_argument('--output', default='benchmark.json', help='Where to write the JSON results')
+        parser.add_argument('--compare', metavar='BASELINE', help='JSON results of an earlier run to diff against')
+        parser.add_argument('--max-regression', type=float, default=25.0,
+                            help='Percent p95 slowdown against --compare that fails the run')
+
+    def handle(self, *args, **options):
+        volumes = self.volumes(options)
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        if connection.vendor == 'sqlite':
+            # In-memory SQLite can't be shared with the WSGI server's threads
+            test_settings = connection.settings_dict.setdefault('TEST', {})
+            if not test_settings.get('NAME') or test_settings['NAME'] == ':memory:':
+                test_settings['NAME'] = os.path.join(tempfile.gettempdir(), 'recovery_benchmark.sqlite3')
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        # One JSON line per request from PerformanceMiddleware would swamp the output
+        performance_logger = logging.getLogger('api.performance')
+        log_level = performance_logger.level
+        performance_logger.setLevel(logging.WARNING)
+        try:
+            with override_settings(**self.benchmark_settings(options)), \
+                    mock.patch('api.authentication.token_cache', VerifiedTokenCache(max_size=16)) as token_cache:
+                # Any request with the benchmark token authenticates without contacting Firebase
+                token_cache.set(ADMIN_TOKEN, {'uid': 'benchmark', 'email': 'benchmark@example.com',
+                                              'exp': time.time() + 24 * 3600})
+                self.seed(volumes)
+                results = self.run_benchmarks(options)
+        finally:
+            performance_logger.setLevel(log_level)
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+
+        report = {
+            'meta': {
+                'commit': self.git_commit(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'volumes': volumes,
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'cache': 'dummy' if options['no_cache'] else 'locmem',
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        self.stdout.write(f"Wrote {len(results)} results to {options['output']}")
+        if baseline is not None:
+            self.compare(baseline, report, options['max_regression'])
+
+    def volumes(self, options):
+        volumes = dict(DEFAULT_VOLUMES)
+        for entry in options['volume']:
+            name, _, rows = entry.partition('=')
+            if name not in volumes or not rows.isdigit():
+                raise CommandError(f"--volume takes MODEL=ROWS with MODEL one of {', '.join(volumes)}, not {entry!r}")
+            volumes[name] = int(rows)
+        return {
+            name: rows if name == 'SiteSettings' else max(int(rows * options['scale']), 1)
+            for name, rows in volumes.items()
+        }
+
+    def benchmark_settings(self, options):
+        return {
+            'DEBUG': False,
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            'PERFORMANCE_SERVER_TIMING': True,
+            'QUERY_DETECTOR': 'off',
+            'METRICS_TOKEN': ADMIN_TOKEN,
+            # The admin pages can't use the manifest storage without a collectstatic run
+            'STATICFILES_STORAGE': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+            # Never share the configured (possibly production) cache with the test database
+            'CACHES': {'default': {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache' if options['no_cache']
+                else 'django.core.cache.backends.locmem.LocMemCache',
+            }},
+        }
+
+    def seed(self, volumes):
+        for name, rows in volumes.items():
+            model = apps.get_model('api', name)
+            existing = model.objects.count()
+            if existing >= rows:
+                continue
+            started = time.perf_counter()
+            seed_bulk(model, rows - existing, start=existing)
+            # bulk_create sends no post_save, so invalidate cached responses here
+            bump_model_version(model)
+            self.stdout.write(f'Seeded {rows - existing} {name} rows in {time.perf_counter() - started:.1f} s')
+
+    def endpoints(self, options):
+        """(name, path) for every GET route worth timing"""
+        found = [('root', '/'), ('health', '/health/'), ('metrics', '/metrics/'),
+                 ('homepage', '/api/homepage/'), ('dashboard', '/api/dashboard/')]
+        for prefix, viewset, basename in router.registry:
+            found.append((f'{basename}-list', f'/api/{prefix}/'))
+            pk = viewset.queryset.model.objects.order_by('pk').values_list('pk', flat=True).first()
+            if pk is not None:
+                found.append((f'{basename}-detail', f'/api/{prefix}/{pk}/'))
+            for extra_action in viewset.get_extra_actions():
+                if 'get' not in extra_action.mapping:
+                    continue
+                if extra_action.detail:
+                    if pk is not None:
+                        found.append((f'{basename}-{extra_action.url_path}', f'/api/{prefix}/{pk}/{extra_action.url_path}/'))
+                else:
+                    found.append((f'{basename}-{extra_action.url_path}', f'/api/{prefix}/{extra_action.url_path}/'))
+        found.append(('admin-index', '/admin/'))
+        for model in admin.site._registry:
+            meta = model._meta
+            found.append((f'admin-{meta.app_label}-{meta.model_name}-changelist', f'/admin/{meta.app_label}/{meta.model_name}/'))
+            pk = model.objects.order_by('pk').values_list('pk', flat=True).first()
+            if pk is not None:
+                found.append((f'admin-{meta.app_label}-{meta.model_name}-change', f'/admin/{meta.app_label}/{meta.model_name}/{pk}/change/'))
+        found += [(path, path) for path in options['path']]
+        if options['endpoint']:
+            found = [(name, path) for name, path in found
+                     if any(text in name or text in path for text in options['endpoint'])]
+        return found
+
+    def admin_session(self):
+        """Session cookie of a Django superuser for the /admin/ pages"""
+        User = get_user_model()
+        user = User.objects.filter(username='benchmark').first()
+        if user is None:
+            user = User.objects.create_superuser('benchmark', 'benchmark@example.com', None)
+        client = Client()
+        client.force_login(user)
+        return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def run_benchmarks(self, options):
+        session = self.admin_session()
+        users = {
+            'anonymous': {},
+            # API routes authenticate with the stubbed Firebase token, /admin/ with the session
+            'admin': {'Authorization': f'Bearer {ADMIN_TOKEN}', 'Cookie': f'{settings.SESSION_COOKIE_NAME}={session}'},
+        }
+        transports = ['client', 'server'] if options['transport'] == 'both' else [options['transport']]
+        endpoints = self.endpoints(options)
+        results = {}
+        for transport in transports:
+            server = None
+            if transport == 'server':
+                server = BenchmarkServer(('127.0.0.1', 0), QuietRequestHandler)
+                server.set_app(WSGIHandler())
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+            fetch = self.fetch_client if server is None else self.server_fetcher(server.server_address[1])
+            try:
+                for name, path in endpoints:
+                    for who, headers in users.items():
+                        if who == 'anonymous' and path.startswith('/admin/'):
+                            continue
+                        result = self.time_endpoint(fetch, path, headers, options)
+                        if result is None:
+                            continue
+                        key = f'{transport} {who} {name}'
+                        results[key] = {'path': path, **result}
+                        self.stdout.write(
+                            f"{key:<64} p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}  "
+                            f"p99 {result['p99_ms']:8.2f} ms  {result['throughput_rps']:8.1f} req/s  "
+                            f"{result['queries']} queries" + (f"  {result['errors']} errors" if result['errors'] else '')
+                        )
+            finally:
+                if server is not None:
+                    server.shutdown()
+                    server.server_close()
+        return results
+
+    def fetch_client(self, path, headers):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client(raise_request_exception=False)
+            if threading.current_thread() is not threading.main_thread():
+                # Let the main thread close this worker's connections once the endpoint is done
+                for conn in connections.all():
+                    conn.inc_thread_sharing()
+                    self._worker_connections.append(conn)
+        extra = {f"HTTP_{name.upper().replace('-', '_')}": value for name, value in headers.items()}
+        response = client.get(path, **extra)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response.status_code, response.get('Server-Timing')
+
+    def server_fetcher(self, port):
+        def fetch(path, headers):
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                return response.status, response.getheader('Server-Timing')
+            finally:
+                conn.close()
+        return fetch
+
+    def time_endpoint(self, fetch, path, headers, options):
+        """Latency percentiles, throughput and queries for one path, or None if the user may not GET it"""
+        self._local = threading.local()
+        self._worker_connections = []
+        try:
+            return self.measure(fetch, path, headers, options)
+        finally:
+            for conn in self._worker_connections:
+                conn.close()
+                conn.dec_thread_sharing()
+
+    def measure(self, fetch, path, headers, options):
+        status, _ = fetch(path, headers)
+        if status in (401, 403, 404, 405):
+            return None
+        for _ in range(options['warmup']):
+            fetch(path, headers)
+
+        def timed_fetch(_):
+            started = time.perf_counter()
+            status, server_timing = fetch(path, headers)
+            return time.perf_counter() - started, status, queries_from(server_timing)
+
+        started = time.perf_counter()
+        if options['concurrency'] > 1:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                samples = list(executor.map(timed_fetch, range(options['requests'])))
+        else:
+            samples = [timed_fetch(index) for index in range(options['requests'])]
+        wall = time.perf_counter() - started
+
+        latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+        query_counts = sorted(queries for _, _, queries in samples if queries is not None)
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for _, status, _ in samples if status >= 400),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'max_ms': round(latencies[-1], 3),
+            'throughput_rps': round(len(samples) / wall, 1),
+            'queries': percentile(query_counts, 50),
+            'max_queries': query_counts[-1] if query_counts else None,
+        }
+
+    def compare(self, baseline, report, max_regression):
+        """Print p95 and query count changes against ``baseline``; fail on regressions"""
+        regressions = []
+        old_results = baseline.get('results', {})
+        self.stdout.write(f"Compared with {baseline.get('meta', {}).get('commit') or 'baseline'}:")
+        for key, result in sorted(report['results'].items()):
+            old = old_results.get(key)
+            if old is None:
+                self.stdout.write(f'new   {key}')
+                continue
+            change = (result['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0.0
+            line = f"{key:<64} p95 {old['p95_ms']:8.2f} -> {result['p95_ms']:8.2f} ms ({change:+.0f}%)"
+            more_queries = (result['queries'] or 0) > (old['queries'] or 0)
+            if more_queries:
+                line += f"  queries {old['queries']} -> {result['queries']}"
+            if change > max_regression or more_queries:
+                regressions.append(key)
+                self.stdout.write(self.style.ERROR(f'SLOWER {line}'))
+            else:
+                self.stdout.write(f'ok     {line}')
+        for key in sorted(set(old_results) - set(report['results'])):
+            self.stdout.write(f'gone  {key}')
+        if regressions:
+            raise CommandError(f"{len(regressions)} endpoints regressed against the baseline")
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,85 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from rest_framework.renderers import JSONRenderer
+from api import renderers
+from api.management.seed import seed
+from api.models import Program, Housing, Donor, Review
+from api.serializers import ProgramSerializer, HousingSerializer, DonorSerializer, ReviewSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Compare the JSON backends of api.renderers on realistic API payloads. '
+            'Rows are created in a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per model')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per backend')
+
+    def best_of(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def payloads(self, rows):
+        """Serialized lists like the API returns, with long text and JSON columns"""
+        long_text = 'Evidence-based recovery support with peer mentoring. ' * 40
+        for index in range(rows):
+            program = seed(Program, index)
+            program.description = long_text
+            program.features = [f'Feature {n} — counselling, groups & aftercare' for n in range(12)]
+            program.save()
+            housing = seed(Housing, index)
+            housing.description = long_text
+            housing.amenities = [{'name': f'Amenity {n}', 'included': n % 2 == 0} for n in range(10)]
+            housing.save()
+            seed(Donor, index)
+            review = seed(Review, index)
+            review.content = long_text
+            review.save()
+        context = {'request': RequestFactory().get('/api/')}
+        return {
+            'programs': ProgramSerializer(Program.objects.all(), many=True, context=context).data,
+            'housing': HousingSerializer(Housing.objects.all(), many=True, context=context).data,
+            'donors': DonorSerializer(Donor.objects.all(), many=True).data,
+            'reviews': ReviewSerializer(Review.objects.all(), many=True).data,
+            # Raw model values, so Decimal and datetime reach the encoder directly
+            'donor_values': list(Donor.objects.values()),
+        }
+
+    def handle(self, *args, **options):
+        backends = ['stdlib'] + (['orjson'] if renderers.orjson is not None else [])
+        if len(backends) == 1:
+            self.stdout.write(self.style.WARNING('orjson is not installed; only the stdlib backend is available'))
+        try:
+            with transaction.atomic():
+                payloads = self.payloads(options['rows'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        for name, data in payloads.items():
+            reference = JSONRenderer().render(data)
+            results = []
+            for backend in backends:
+                with override_settings(JSON_BACKEND=backend):
+                    renderer = renderers.FastJSONRenderer()
+                    parser = renderers.FastJSONParser()
+                    rendered = renderer.render(data)
+                    if rendered != reference:
+                        raise CommandError(f'{backend} output differs from DRF JSONRenderer for {name}')
+                    render_time = self.best_of(options['repeat'], lambda: renderer.render(data))
+                    parse_time = self.best_of(options['repeat'], lambda: parser.parse(io.BytesIO(rendered)))
+                results.append(f'{backend} render {render_time * 1000:7.2f} ms parse {parse_time * 1000:7.2f} ms')
+            self.stdout.write(f"{name:<13} {len(reference) / 1024:8.1f} KiB  " + '  |  '.join(results))
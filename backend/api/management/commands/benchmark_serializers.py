@@ -0,0 +1,91 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from rest_framework.renderers import JSONRenderer
+from api.fast_serializers import get_values_serializer
+from api.management.seed import seed
+from api.models import Review, Program, Housing, AmazonWishList, Donor
+from api.serializers import (
+    PublicReviewSerializer, PublicDonorSerializer, ProgramSerializer,
+    HousingSerializer, AmazonWishListSerializer
+)
+
+CASES = [
+    (PublicReviewSerializer, Review),
+    (PublicDonorSerializer, Donor),
+    (ProgramSerializer, Program),
+    (HousingSerializer, Housing),
+    (AmazonWishListSerializer, AmazonWishList),
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Check that the .values() fast path renders byte-identical JSON to the DRF serializers '
+            'and compare their speed. Rows are created in a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200, help='Rows per model')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per serializer')
+
+    def best_of(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    # RequestFactory requests come from 'testserver', which ALLOWED_HOSTS rejects
+    @override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'])
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/api/')
+        renderer = JSONRenderer()
+        mismatches = []
+        try:
+            with transaction.atomic():
+                for serializer_class, model in CASES:
+                    for index in range(options['rows']):
+                        seed(model, index)
+                    # Include a row with optional fields empty and an image set
+                    extra = seed(model, 'edge')
+                    if hasattr(extra, 'image'):
+                        extra.image.name = 'programs/example photo.jpg'
+                        extra.save()
+                    if model is Donor:
+                        Donor.objects.create(name='Hidden', amount=None, is_anonymous=True)
+
+                    queryset = model.objects.all()
+                    values_serializer = get_values_serializer(serializer_class)
+                    if values_serializer is None:
+                        raise CommandError(f'{serializer_class.__name__} does not compile to a ValuesSerializer')
+                    context = {'request': request}
+
+                    def drf():
+                        return renderer.render(serializer_class(queryset.all(), many=True, context=context).data)
+
+                    def fast():
+                        return renderer.render(values_serializer.serialize(queryset.all(), request))
+
+                    if drf() != fast():
+                        mismatches.append(serializer_class.__name__)
+                        self.stdout.write(self.style.ERROR(f'MISMATCH {serializer_class.__name__}'))
+                        continue
+                    drf_time = self.best_of(options['repeat'], drf)
+                    fast_time = self.best_of(options['repeat'], fast)
+                    self.stdout.write(
+                        f'{serializer_class.__name__:<26} identical  drf {drf_time * 1000:8.2f} ms  '
+                        f'values {fast_time * 1000:8.2f} ms  {drf_time / fast_time:5.1f}x'
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+        if mismatches:
+            raise CommandError(f"Output differs for: {', '.join(mismatches)}")
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api.snapshots import SNAPSHOT_MODELS, rebuild_all
+
+
+class Command(BaseCommand):
+    help = ('Build the precomputed public snapshots (settings.PUBLIC_SNAPSHOTS), e.g. after a deploy. '
+            'They are otherwise built on first request and rebuilt whenever their content changes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', metavar='NAME', help=f"Snapshots to build, from {', '.join(SNAPSHOT_MODELS)}")
+
+    def handle(self, *args, **options):
+        if not settings.PUBLIC_SNAPSHOTS:
+            raise CommandError('PUBLIC_SNAPSHOTS is not set')
+        unknown = set(options['names']) - set(SNAPSHOT_MODELS)
+        if unknown:
+            raise CommandError(f"Unknown snapshots: {', '.join(sorted(unknown))}")
+        failed = 0
+        for name, snapshot in rebuild_all(options['names']).items():
+            if snapshot is None:
+                failed += 1
+                self.stderr.write(f'{name}: failed, see the api.snapshots log')
+                continue
+            sizes = ', '.join(f'{coding} {len(data)}' for coding, data in sorted(snapshot.encoded.items()))
+            self.stdout.write(f"{name}: {len(snapshot.body)} bytes{f' ({sizes})' if sizes else ''}")
+        built = len(options['names'] or SNAPSHOT_MODELS) - failed
+        self.stdout.write(self.style.SUCCESS(f'Built {built} snapshots ({failed} failed)'))
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from api.management.seed import seed
+from api.models import ContactForm, Review, Program, Housing, SiteSettings, AmazonWishList, Donor, HousingApplication
+from api.query_detector import QueryDetector
+from api.urls import router
+from api.views import HomepageView, DashboardView
+
+
+class Rollback(Exception):
+    pass
+
+
+class NotPermitted(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Check that every list endpoint in api.urls, plus the homepage and dashboard bundles, runs a '
+            'constant number of queries regardless of row count, with no duplicate, N+1 or slow queries. '
+            'Rows are created in a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5, help='Rows to compare against a single row')
+
+    def endpoints(self):
+        """(label, view, path, models to seed) for every list and list-style GET action in the
+        router, and the aggregate homepage and dashboard views"""
+        for prefix, viewset, basename in router.registry:
+            models = (viewset.queryset.model,)
+            yield f'{basename}-list', viewset.as_view({'get': 'list'}), f'/api/{prefix}/', models
+            for extra_action in viewset.get_extra_actions():
+                if not extra_action.detail and 'get' in extra_action.mapping:
+                    view = viewset.as_view({'get': extra_action.__name__})
+                    path = f'/api/{prefix}/{extra_action.url_path}/'
+                    yield f'{basename}-{extra_action.url_path}', view, path, models
+        yield 'homepage', HomepageView.as_view(), '/api/homepage/', (SiteSettings, Review, Donor, Program, Housing)
+        yield 'dashboard', DashboardView.as_view(), '/api/dashboard/', (
+            ContactForm, Review, Program, Housing, AmazonWishList, Donor, HousingApplication
+        )
+
+    def count_queries(self, view, path, user):
+        request = APIRequestFactory().get(path)
+        if user is not None:
+            force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = view(request)
+            if response.streaming:
+                # Streamed exports query while the body is consumed
+                for _ in response.streaming_content:
+                    pass
+            else:
+                response.render()
+        if response.status_code in (401, 403):
+            raise NotPermitted
+        if response.status_code != 200:
+            raise CommandError(f'GET {path} returned {response.status_code}')
+        return len(queries)
+
+    # Cached responses would hide the queries being counted
+    # APIRequestFactory requests come from 'testserver', which ALLOWED_HOSTS rejects
+    @override_settings(
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+    )
+    def handle(self, *args, **options):
+        admin = type('User', (), {'uid': 'query-count-check', 'is_authenticated': True})()
+        failures = []
+        try:
+            with transaction.atomic():
+                for label, view, path, models in self.endpoints():
+                    for user in (None, admin):
+                        who = 'admin' if user else 'anonymous'
+                        for model in models:
+                            seed(model, 0)
+                        try:
+                            # Warm-up request absorbs one-off queries such as creating SiteSettings
+                            self.count_queries(view, path, user)
+                        except NotPermitted:
+                            self.stdout.write(f'skip  {label} ({who}): not permitted')
+                            continue
+                        single = self.count_queries(view, path, user)
+                        for index in range(1, options['rows']):
+                            for model in models:
+                                seed(model, index)
+                        with QueryDetector(label) as detector:
+                            many = self.count_queries(view, path, user)
+                        problems = [detector.describe(problem) for problem in detector.problems()]
+                        if single != many:
+                            self.stdout.write(self.style.ERROR(f'FAIL  {label} ({who}): {single} -> {many} queries'))
+                            failures.append(label)
+                        elif problems:
+                            self.stdout.write(self.style.ERROR(f'FAIL  {label} ({who}): ' + '\n      '.join(problems)))
+                            failures.append(label)
+                        else:
+                            self.stdout.write(f'ok    {label} ({who}): {single} queries')
+                raise Rollback
+        except Rollback:
+            pass
+        if failures:
+            raise CommandError(f"Query problems in: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('All checked endpoints run a constant number of queries with no repeats'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from api.models import ContactForm, Review, Program, Housing, AmazonWishList, Donor, HousingApplication
+
+
+def access_paths():
+    """(index name, queryset) pairs mirroring the filters and ordering used in api.views"""
+    return [
+        ('review_featured_idx', Review.objects.filter(is_featured=True, is_approved=True)),
+        ('review_approved_idx', Review.objects.filter(is_approved=True)),
+        ('donor_featured_idx', Donor.objects.filter(is_featured=True).order_by('-created_at')),
+        ('program_active_idx', Program.objects.filter(is_active=True)),
+        ('housing_available_idx', Housing.objects.filter(is_available=True)),
+        ('wishlist_active_idx', AmazonWishList.objects.filter(is_active=True)),
+        ('contactform_status_idx', ContactForm.objects.filter(status='new')),
+        ('housingapp_status_idx', HousingApplication.objects.filter(status='new')),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the public and admin list queries and check that each uses its index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan for every query')
+
+    def handle(self, *args, **options):
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Small tables are cheaper to scan sequentially; ask the
+                # planner which index it would use once they grow
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            for index_name, queryset in access_paths():
+                plan = queryset.explain()
+                if options['verbose_plans']:
+                    self.stdout.write(f'{index_name}:\n{plan}\n')
+                if index_name in plan:
+                    self.stdout.write(f'ok    {index_name}')
+                else:
+                    self.stdout.write(self.style.ERROR(f'MISS  {index_name}'))
+                    failures.append((index_name, plan))
+        if failures:
+            details = '\n'.join(f'{name}:\n{plan}' for name, plan in failures)
+            raise CommandError(f'{len(failures)} queries do not use their index:\n{details}')
+        self.stdout.write(self.style.SUCCESS('All access paths use their indexes'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.images import IMAGE_FIELDS, Image, generate_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Create the resized image copies for site, program and housing images that are missing or stale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild derivatives that are already up to date')
+
+    def handle(self, *args, **options):
+        if Image is None:
+            raise CommandError('Pillow is not installed')
+        changed = failed = 0
+        for model, field_name in IMAGE_FIELDS:
+            for pk in model.objects.order_by('pk').values_list('pk', flat=True):
+                try:
+                    if generate_derivatives(model, pk, field_name, force=options['force']):
+                        changed += 1
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f'{model.__name__} #{pk}: {e}')
+        self.stdout.write(self.style.SUCCESS(f'Updated derivatives for {changed} images ({failed} failed)'))
@@ -0,0 +1,192 @@
+import csv
+import datetime
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from api.cache import bump_model_version
+from api.serializers import DonorSerializer, ReviewSerializer, ProgramSerializer
+
+# Peak RSS is read from the resource module, which Windows lacks
+try:
+    import resource
+except ImportError:
+    resource = None
+
+TARGETS = {
+    'donors': DonorSerializer,
+    'reviews': ReviewSerializer,
+    'programs': ProgramSerializer,
+}
+
+
+def parse_created_at(value):
+    """Aware datetime from an ISO 8601 datetime or date (midnight), or None if it doesn't parse"""
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            parsed = datetime.datetime.combine(date, datetime.time()) if date else None
+    except (TypeError, ValueError):
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+@contextmanager
+def keep_created_at(model):
+    """Let bulk_create() store the created_at set on each instance instead of the current time"""
+    field = model._meta.get_field('created_at')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def peak_memory_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = ('Import donors, reviews or programs from a CSV or NDJSON file. Rows are validated with the API '
+            'serializers and saved with bulk_create, one transaction per batch. An optional created_at '
+            'column (ISO 8601 datetime or date) keeps the original dates of historical rows.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', choices=sorted(TARGETS), help='What the file contains')
+        parser.add_argument('path', help='CSV file with a header row, or NDJSON with one object per line')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Input format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows saved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every row without saving anything')
+        parser.add_argument('--checkpoint', help='Progress file (default: <path>.checkpoint)')
+        parser.add_argument('--resume', action='store_true', help='Skip the rows recorded in the checkpoint')
+
+    def read_rows(self, path, input_format, json_fields):
+        """Yield (line number, row dict) without loading the whole file"""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            if input_format == 'ndjson':
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except ValueError as e:
+                        yield line_number, e
+                        continue
+                    yield line_number, row if isinstance(row, dict) else ValueError('Expected a JSON object')
+                return
+            reader = csv.DictReader(f)
+            for row in reader:
+                # Empty cells fall back to the model defaults
+                row = {key: value for key, value in row.items() if key and value != ''}
+                try:
+                    for name in json_fields.intersection(row):
+                        row[name] = json.loads(row[name])
+                except ValueError as e:
+                    yield reader.line_num, e
+                    continue
+                yield reader.line_num, row
+
+    def load_checkpoint(self, checkpoint, path, target):
+        try:
+            with open(checkpoint) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            raise CommandError(f'No checkpoint at {checkpoint}')
+        if state.get('path') != os.path.abspath(path) or state.get('target') != target:
+            raise CommandError(f'{checkpoint} belongs to a different import')
+        return state['rows']
+
+    def save_checkpoint(self, checkpoint, path, target, rows):
+        tmp_path = f'{checkpoint}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'path': os.path.abspath(path), 'target': target, 'rows': rows}, f)
+        os.replace(tmp_path, checkpoint)
+
+    def handle(self, *args, **options):
+        target, path = options['target'], options['path']
+        serializer_class = TARGETS[target]
+        model = serializer_class.Meta.model
+        input_format = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        checkpoint = options['checkpoint'] or f'{path}.checkpoint'
+        dry_run = options['dry_run']
+        if not os.path.exists(path):
+            raise CommandError(f'{path} does not exist')
+
+        json_fields = {field.name for field in model._meta.concrete_fields if isinstance(field, models.JSONField)}
+        # Files can't come from a spreadsheet, so file columns name already-stored paths
+        file_fields = {field.name for field in model._meta.concrete_fields if isinstance(field, models.FileField)}
+        skip = self.load_checkpoint(checkpoint, path, target) if options['resume'] else 0
+
+        started = time.perf_counter()
+        rows_read = created = invalid = 0
+        batch = []
+
+        def flush():
+            nonlocal created
+            if not dry_run and batch:
+                with transaction.atomic(), keep_created_at(model):
+                    model.objects.bulk_create(batch)
+                # Record progress only once the batch is committed
+                self.save_checkpoint(checkpoint, path, target, rows_read)
+            created += len(batch)
+            batch.clear()
+
+        for line_number, row in self.read_rows(path, input_format, json_fields):
+            rows_read += 1
+            if rows_read <= skip:
+                continue
+            if isinstance(row, Exception):
+                invalid += 1
+                self.stderr.write(f'Line {line_number}: {row}')
+                continue
+            files = {name: row.pop(name) for name in file_fields.intersection(row)}
+            # Read-only in the serializers, so it is parsed here
+            created_at = row.pop('created_at', None)
+            if created_at is not None:
+                created_at = parse_created_at(created_at)
+                if created_at is None:
+                    invalid += 1
+                    errors = {'created_at': ['Expected an ISO 8601 datetime or date.']}
+                    self.stderr.write(f'Line {line_number}: {json.dumps(errors)}')
+                    continue
+            serializer = serializer_class(data=row)
+            if not serializer.is_valid():
+                invalid += 1
+                self.stderr.write(f'Line {line_number}: {json.dumps(serializer.errors)}')
+                continue
+            instance = model(**serializer.validated_data)
+            for name, value in files.items():
+                setattr(instance, name, value)
+            instance.created_at = created_at or timezone.now()
+            batch.append(instance)
+            if len(batch) >= options['batch_size']:
+                flush()
+        flush()
+
+        if not dry_run:
+            # bulk_create sends no post_save, so invalidate cached lists here
+            if created:
+                bump_model_version(model)
+            if os.path.exists(checkpoint):
+                os.remove(checkpoint)
+
+        elapsed = time.perf_counter() - started
+        skipped = min(skip, rows_read)
+        rate = (rows_read - skipped) / elapsed if elapsed else 0
+        peak = peak_memory_mb()
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Validated' if dry_run else 'Imported'} {created} {target} "
+            f'({invalid} invalid, {skipped} skipped from checkpoint) in {elapsed:.2f}s, {rate:.0f} rows/s'
+        ))
+        self.stdout.write(f"Peak memory: {f'{peak:.1f} MB' if peak is not None else 'n/a'}")
@@ -0,0 +1,32 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.submissions import claim_batch, process_batch
+
+
+class Command(BaseCommand):
+    help = 'Save queued public form submissions and run their post-processing hooks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Submissions claimed per batch')
+        parser.add_argument('--max-attempts', type=int, default=settings.SUBMISSION_MAX_ATTEMPTS,
+                            help='Failed attempts before a submission is dead-lettered')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the queue instead of exiting when it is empty')
+        parser.add_argument('--sleep', type=float, default=5, help='Seconds to wait between polls in --loop mode')
+
+    def handle(self, *args, **options):
+        while True:
+            submissions = claim_batch(options['batch_size'])
+            if submissions:
+                counts = process_batch(submissions, options['max_attempts'])
+                self.stdout.write(
+                    f"Processed {len(submissions)} submissions: "
+                    f"{counts['done']} done, {counts['retry']} to retry, {counts['dead']} dead"
+                )
+                # A full batch means more may be waiting
+                if len(submissions) == options['batch_size']:
+                    continue
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from api.keys import KeyRefresher
+
+
+class Command(BaseCommand):
+    help = "Fetch Google's Firebase signing certificates into the configured key provider"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Refresh even if the stored keys are still valid')
+
+    def handle(self, *args, **options):
+        if not settings.FIREBASE_KEY_PROVIDER:
+            raise CommandError('FIREBASE_KEY_PROVIDER is not configured')
+        provider = import_string(settings.FIREBASE_KEY_PROVIDER)()
+        if not provider.refreshable:
+            self.stdout.write(f'{type(provider).__name__} uses fixed keys; nothing to refresh')
+            return
+        try:
+            key_set = KeyRefresher(provider).refresh(force=options['force'])
+        except Exception as e:
+            raise CommandError(f'Could not refresh Firebase signing keys: {e}')
+        self.stdout.write(self.style.SUCCESS(f'{len(key_set.keys)} signing keys stored in {type(provider).__name__}'))
@@ -0,0 +1,90 @@
+"""Sample rows for the management-command checks and benchmarks"""
+from django.utils import timezone
+from api.models import (
+    ContactForm, Review, Program, Housing, SiteSettings, AmazonWishList, Donor, HousingApplication, QueuedSubmission
+)
+
+
+def seed(model, index):
+    """Create one row of ``model`` visible to both public and admin lists"""
+    if model is ContactForm:
+        return ContactForm.objects.create(name=f'Contact {index}', email='contact@example.com', message='Hello')
+    if model is Review:
+        return Review.objects.create(author_name=f'Author {index}', rating=5, content='Great', is_approved=True, is_featured=True)
+    if model is Program:
+        return Program.objects.create(name=f'Program {index}', description='Program', features=['a', 'b'])
+    if model is Housing:
+        return Housing.objects.create(name=f'Housing {index}', description='Housing', amenities=['a', 'b'])
+    if model is AmazonWishList:
+        return AmazonWishList.objects.create(name=f'List {index}', url='https://www.amazon.com/hz/wishlist/ls/TEST')
+    if model is Donor:
+        return Donor.objects.create(name=f'Donor {index}', amount='25.00', message='Thanks')
+    if model is HousingApplication:
+        return HousingApplication.objects.create(
+            first_name='First', last_name=f'Last {index}', email='applicant@example.com', phone='555-0100',
+            reason_for_applying='Recovery', preferred_housing=seed(Housing, f'for application {index}'),
+        )
+    if model is SiteSettings:
+        return SiteSettings.objects.get_or_create(pk=1)[0]
+    raise ValueError(f'No seed data for {model.__name__}')
+
+
+def build(model, index, housing_ids=()):
+    """Unsaved row of ``model`` for bulk seeding, with a realistic mix of states"""
+    if model is ContactForm:
+        return ContactForm(
+            name=f'Contact {index}', email=f'contact{index}@example.com', phone='555-0100',
+            message='I would like to learn more about your programs. ' * 4,
+            status=('new', 'contacted', 'in_progress', 'resolved')[index % 4],
+        )
+    if model is Review:
+        return Review(
+            author_name=f'Author {index}', author_location='Springfield', rating=index % 5 + 1,
+            content='The staff helped me every step of the way. ' * 6,
+            is_approved=index % 4 != 0, is_featured=index % 10 == 0,
+        )
+    if model is Program:
+        return Program(
+            name=f'Program {index}', description='Evidence-based recovery support. ' * 20, duration='90 days',
+            features=[f'Feature {n}' for n in range(8)], is_active=index % 10 != 0, order=index,
+        )
+    if model is Housing:
+        return Housing(
+            name=f'Housing {index}', description='Sober living close to transit. ' * 20, capacity=12,
+            amenities=[f'Amenity {n}' for n in range(8)], is_available=index % 10 != 0, order=index,
+        )
+    if model is AmazonWishList:
+        return AmazonWishList(
+            name=f'List {index}', url='https://www.amazon.com/hz/wishlist/ls/TEST', description='Household items',
+            is_active=index % 10 != 0, order=index,
+        )
+    if model is Donor:
+        return Donor(
+            name=f'Donor {index}', amount=f'{index % 500 + 5}.00' if index % 3 else None,
+            message='Keep up the great work' if index % 2 else '',
+            is_anonymous=index % 7 == 0, is_featured=index % 5 != 0,
+        )
+    if model is HousingApplication:
+        return HousingApplication(
+            first_name='First', last_name=f'Last {index}', email=f'applicant{index}@example.com', phone='555-0100',
+            reason_for_applying='Recovery', employment_status='Part time',
+            preferred_housing_id=housing_ids[index % len(housing_ids)] if housing_ids else None,
+            status=('new', 'reviewing', 'approved', 'denied', 'waitlisted')[index % 5],
+        )
+    if model is QueuedSubmission:
+        return QueuedSubmission(
+            kind='contact_form', payload={'name': f'Contact {index}', 'email': 'contact@example.com', 'message': 'Hello'},
+            status='done', attempts=1, available_at=timezone.now(), processed_at=timezone.now(),
+        )
+    raise ValueError(f'No bulk seed data for {model.__name__}')
+
+
+def seed_bulk(model, count, start=0, batch_size=1000):
+    """bulk_create ``count`` rows of ``model`` numbered from ``start``"""
+    if model is SiteSettings:
+        SiteSettings.objects.get_or_create(pk=1)
+        return
+    housing_ids = list(Housing.objects.values_list('pk', flat=True)) if model is HousingApplication else ()
+    for offset in range(start, start + count, batch_size):
+        stop = min(offset + batch_size, start + count)
+        model.objects.bulk_create([build(model, index, housing_ids) for index in range(offset, stop)])
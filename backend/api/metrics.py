@@ -0,0 +1,196 @@
+"""
+Per-request timing breakdown and latency histograms.
+
+api.middleware.PerformanceMiddleware opens a RequestTimings for every request
+and code paths worth separating mark themselves with ``timed(phase)``:
+Firebase verification ('auth') and JSON rendering ('render'). Database time
+comes from an execute wrapper installed on every connection, which finds the
+request through a context variable, so it also covers ORM calls that async
+views run in sync_to_async threads. Finished requests are aggregated
+per route and viewset action into in-process histograms that metrics_view
+serves in the Prometheus text format. Each worker process keeps its own
+registry, so scrape every worker (or run one) for complete numbers.
+"""
+import hmac
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, Http404
+
+# Upper bounds, in seconds, of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Seconds spent per phase, plus database query count, for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.db_queries = 0
+        self._active = set()
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook timing every query"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add('db', time.perf_counter() - started)
+            self.db_queries += 1
+
+
+def current_timings():
+    return _current.get()
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    """Time the query against the current request, if there is one"""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings(execute, sql, params, many, context)
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    """connection_created receiver adding execute_wrapper to each new connection"""
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+def start_request():
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(phase):
+    """Add the enclosed time to ``phase`` of the current request (outermost use only)"""
+    timings = _current.get()
+    if timings is None or phase in timings._active:
+        yield
+        return
+    timings._active.add(phase)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings._active.discard(phase)
+        timings.add(phase, time.perf_counter() - started)
+
+
+class Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Request latency histograms and phase totals keyed by (route, action, method)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations = {}
+        self.phases = {}
+        self.queries = {}
+        self.responses = {}
+
+    def record(self, route, action, method, status, timings, total):
+        key = (route, action, method)
+        with self._lock:
+            self.durations.setdefault(key, Histogram()).observe(total)
+            for phase, seconds in timings.phases.items():
+                self.phases[key + (phase,)] = self.phases.get(key + (phase,), 0.0) + seconds
+            self.queries[key] = self.queries.get(key, 0) + timings.db_queries
+            status_key = key + (str(status),)
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self.durations.clear()
+            self.phases.clear()
+            self.queries.clear()
+            self.responses.clear()
+
+    def render_prometheus(self):
+        def labels(route, action, method, **extra):
+            pairs = [('route', route), ('action', action), ('method', method), *extra.items()]
+            return ','.join(f'{name}="{escape(value)}"' for name, value in pairs)
+
+        lines = [
+            '# HELP api_request_duration_seconds Request latency by route and viewset action',
+            '# TYPE api_request_duration_seconds histogram',
+        ]
+        with self._lock:
+            for key, histogram in sorted(self.durations.items()):
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    lines.append(f'api_request_duration_seconds_bucket{{{labels(*key, le=str(bound))}}} {count}')
+                lines.append(f'api_request_duration_seconds_bucket{{{labels(*key, le="+Inf")}}} {histogram.count}')
+                lines.append(f'api_request_duration_seconds_sum{{{labels(*key)}}} {histogram.total}')
+                lines.append(f'api_request_duration_seconds_count{{{labels(*key)}}} {histogram.count}')
+            lines += [
+                '# HELP api_request_phase_seconds_total Time spent per request phase',
+                '# TYPE api_request_phase_seconds_total counter',
+            ]
+            for (*key, phase), seconds in sorted(self.phases.items()):
+                lines.append(f'api_request_phase_seconds_total{{{labels(*key, phase=phase)}}} {seconds}')
+            lines += [
+                '# HELP api_db_queries_total Database queries run by requests',
+                '# TYPE api_db_queries_total counter',
+            ]
+            for key, count in sorted(self.queries.items()):
+                lines.append(f'api_db_queries_total{{{labels(*key)}}} {count}')
+            lines += [
+                '# HELP api_responses_total Responses by status code',
+                '# TYPE api_responses_total counter',
+            ]
+            for (*key, status), count in sorted(self.responses.items()):
+                lines.append(f'api_responses_total{{{labels(*key, status=status)}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+
+
+def has_metrics_token(request):
+    """Whether the request carries the METRICS_TOKEN bearer token (never, when unset)"""
+    token = settings.METRICS_TOKEN
+    if not token:
+        return False
+    supplied = request.META.get('HTTP_AUTHORIZATION', '')
+    return hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode())
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, authenticated with the METRICS_TOKEN bearer token"""
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    if not has_metrics_token(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,231 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import DisallowedHost, MiddlewareNotUsed
+from django.urls import reverse
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from .async_views import accepts_json
+from .metrics import current_timings, end_request, registry, start_request
+from .query_detector import MODES, QueryDetector
+from . import snapshots
+
+logger = logging.getLogger('api.performance')
+
+# Phases reported in Server-Timing, in display order
+SERVER_TIMING_PHASES = ('db', 'auth', 'app', 'render')
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """WhiteNoise that can also run in an async middleware chain.
+
+    WhiteNoise is sync-only, which makes Django move every ASGI request to a
+    thread before it reaches the async views. Only static file hits need the
+    sync path; everything else is a dictionary lookup.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class PerformanceMiddleware:
+    """Time each request by phase, then report it in Server-Timing, logs and metrics.
+
+    ``app`` is the view's own time outside database access, authentication
+    and rendering, which for these viewsets is mostly serialization.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django runs a sync process_view through sync_to_async; this one
+            # only reads the clock, so keep it on the event loop
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings, token = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings, token = start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, timings)
+
+    def finish(self, request, response, timings):
+        total = time.perf_counter() - timings.started
+
+        view = getattr(request, '_performance_view', None)
+        if view is not None:
+            view_started, db_before = view
+            view_time = time.perf_counter() - view_started
+            in_view = (
+                timings.phases.get('db', 0.0) - db_before
+                + timings.phases.get('auth', 0.0)
+                + timings.phases.get('render', 0.0)
+            )
+            timings.add('app', max(view_time - in_view, 0.0))
+
+        route, action = self.route(request)
+        registry.record(route, action, request.method, response.status_code, timings, total)
+        if settings.PERFORMANCE_SERVER_TIMING:
+            response['Server-Timing'] = self.server_timing(timings, total)
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'route': route,
+            'action': action,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_queries': timings.db_queries,
+            **{f'{phase}_ms': round(timings.phases.get(phase, 0.0) * 1000, 2) for phase in SERVER_TIMING_PHASES},
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = current_timings()
+        db_before = timings.phases.get('db', 0.0) if timings else 0.0
+        request._performance_view = (time.perf_counter(), db_before)
+        # DRF viewsets map the HTTP method to an action name
+        actions = getattr(view_func, 'actions', None) or {}
+        request._performance_action = actions.get(request.method.lower(), '')
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        PerformanceMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    def route(self, request):
+        snapshot = getattr(request, '_public_snapshot', None)
+        if snapshot is not None:
+            return snapshot, 'snapshot'
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unmatched', ''
+        return match.view_name or match.route, getattr(request, '_performance_action', '')
+
+    def server_timing(self, timings, total):
+        entries = []
+        for phase in SERVER_TIMING_PHASES:
+            if phase in timings.phases:
+                entry = f'{phase};dur={timings.phases[phase] * 1000:.2f}'
+                if phase == 'db':
+                    entry += f';desc="{timings.db_queries} queries"'
+                entries.append(entry)
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+
+class QueryDetectorMiddleware:
+    """Report slow, duplicate and N+1 queries per request (settings.QUERY_DETECTOR)"""
+
+    def __init__(self, get_response):
+        if settings.QUERY_DETECTOR not in MODES:
+            raise ValueError(f"QUERY_DETECTOR must be one of {', '.join(MODES)}, not {settings.QUERY_DETECTOR!r}")
+        if settings.QUERY_DETECTOR == 'off':
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with QueryDetector() as detector:
+            response = self.get_response(request)
+        detector.label = getattr(request, '_query_detector_view', request.path)
+        detector.report(settings.QUERY_DETECTOR)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        name = view_class.__name__ if view_class else getattr(view_func, '__name__', repr(view_func))
+        action = (getattr(view_func, 'actions', None) or {}).get(request.method.lower())
+        request._query_detector_view = f'{name}.{action}' if action else name
+
+
+class PublicSnapshotMiddleware:
+    """Answer anonymous JSON GETs of the public endpoints from api.snapshots (settings.PUBLIC_SNAPSHOTS)"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.PUBLIC_SNAPSHOTS not in snapshots.MODES:
+            raise ValueError(f"PUBLIC_SNAPSHOTS must be one of 'file', 'cache' or empty, not {settings.PUBLIC_SNAPSHOTS!r}")
+        if not settings.PUBLIC_SNAPSHOTS:
+            raise MiddlewareNotUsed
+        if not settings.PUBLIC_SNAPSHOT_BASE_URL:
+            raise ValueError('PUBLIC_SNAPSHOTS needs PUBLIC_SNAPSHOT_BASE_URL')
+        self.get_response = get_response
+        self.base_url = settings.PUBLIC_SNAPSHOT_BASE_URL.rstrip('/')
+        self.paths = {reverse(name): name for name in snapshots.SNAPSHOT_MODELS}
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        name = self.snapshot_name(request)
+        if name is not None:
+            snapshot = snapshots.get_snapshot(name)
+            if snapshot is not None:
+                return self.respond(request, name, snapshot)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        name = self.snapshot_name(request)
+        if name is not None:
+            snapshot = await snapshots.aget_snapshot(name)
+            if snapshot is not None:
+                return self.respond(request, name, snapshot)
+        return await self.get_response(request)
+
+    def snapshot_name(self, request):
+        """The snapshot that answers ``request``, if any"""
+        name = self.paths.get(request.path_info)
+        if (
+            name is None
+            or request.method != 'GET'
+            or request.META.get('QUERY_STRING')
+            or 'HTTP_AUTHORIZATION' in request.META
+            or not accepts_json(request)
+        ):
+            return None
+        try:
+            # Absolute URLs in a snapshot are only right for this origin
+            if f'{request.scheme}://{request.get_host()}' != self.base_url:
+                return None
+        except DisallowedHost:
+            return None
+        return name
+
+    def respond(self, request, name, snapshot):
+        # PerformanceMiddleware reports it as the endpoint's 'snapshot' action
+        request._public_snapshot = name
+        return snapshot.response(request)
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_sitesettings_empty_state_color_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['-submitted_at', '-id'], name='contactform_submitted_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donor',
+            index=models.Index(fields=['-created_at', '-id'], name='donor_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='housingapplication',
+            index=models.Index(fields=['-submitted_at', '-id'], name='housingapp_submitted_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['-created_at', '-id'], name='review_created_id_idx'),
+        ),
+    ]
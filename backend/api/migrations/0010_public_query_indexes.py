@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='amazonwishlist',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'name'], name='wishlist_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['status', '-submitted_at'], name='contactform_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donor',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['-created_at'], name='donor_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='housing',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['order', 'name'], name='housing_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='housingapplication',
+            index=models.Index(fields=['status', '-submitted_at'], name='housingapp_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='program',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'name'], name='program_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['-created_at'], name='review_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_approved', True), ('is_featured', True)), fields=['-created_at'], name='review_featured_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_queuedsubmission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='housing',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of the image, filled in by api.images'),
+        ),
+        migrations.AddField(
+            model_name='program',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of the image, filled in by api.images'),
+        ),
+        migrations.AddField(
+            model_name='sitesettings',
+            name='background_image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of the background image, filled in by api.images'),
+        ),
+    ]
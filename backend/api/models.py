@@ -11,6 +11,7 @@ class SiteSettings(models.Model):
     background_color = models.CharField(max_length=7, default="#D8DDE1", help_text="Hex color code (Light Gray)")
     empty_state_color = models.CharField(max_length=7, default="#C19569", help_text="Hex color code for empty state messages (e.g., 'No programs available')")
     background_image = models.ImageField(upload_to='backgrounds/', null=True, blank=True)
+    background_image_derivatives = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of the background image, filled in by api.images")
     hero_title = models.CharField(max_length=200, default="Your Journey to Recovery Starts Here")
     hero_subtitle = models.TextField(default="Compassionate care for lasting recovery")
     mission = models.TextField(default="Our mission is to provide compassionate, evidence-based recovery services that empower individuals to overcome addiction and build a foundation for lasting sobriety.", help_text="Organization mission statement")
@@ -26,6 +27,7 @@ class SiteSettings(models.Model):
     linkedin_url = models.URLField(max_length=500, blank=True, null=True, help_text="LinkedIn page URL")
     youtube_url = models.URLField(max_length=500, blank=True, null=True, help_text="YouTube channel URL")
     tiktok_url = models.URLField(max_length=500, blank=True, null=True, help_text="TikTok profile URL")
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name_plural = "Site Settings"
@@ -37,6 +39,58 @@ class SiteSettings(models.Model):
         # Ensure only one instance exists
         self.pk = 1
         super().save(*args, **kwargs)
+    
+    @classmethod
+    def load(cls):
+        """Return the singleton, re-reading the row only when it changed.
+        
+        With a shared cache (Redis) the check is the model version bumped by
+        the post_save signal (see api.signals), so in steady state this does
+        no DB queries. A per-process cache never sees versions bumped by other
+        workers or replicas, so the check is a one-column updated_at lookup.
+        The returned instance is shared between requests and must not be modified.
+        """
+        from .cache import get_model_versions, shared_cache
+        global _site_settings_cache
+        if shared_cache():
+            stamp = get_model_versions([cls])[0]
+        else:
+            stamp = cls.objects.filter(pk=1).values_list('updated_at', flat=True).first()
+        cached_stamp, instance = _site_settings_cache
+        if stamp is not None and cached_stamp == stamp:
+            return instance
+        instance, created = cls.objects.get_or_create(pk=1)
+        if not shared_cache():
+            stamp = instance.updated_at
+        elif created:
+            # Creating the row bumped the version itself
+            stamp = get_model_versions([cls])[0]
+        _site_settings_cache = (stamp, instance)
+        return instance
+    
+    @classmethod
+    async def aload(cls):
+        """Async load() for views running on the event loop"""
+        from .cache import aget_model_versions, shared_cache
+        global _site_settings_cache
+        if shared_cache():
+            stamp = (await aget_model_versions([cls]))[0]
+        else:
+            stamp = await cls.objects.filter(pk=1).values_list('updated_at', flat=True).afirst()
+        cached_stamp, instance = _site_settings_cache
+        if stamp is not None and cached_stamp == stamp:
+            return instance
+        instance, created = await cls.objects.aget_or_create(pk=1)
+        if not shared_cache():
+            stamp = instance.updated_at
+        elif created:
+            stamp = (await aget_model_versions([cls]))[0]
+        _site_settings_cache = (stamp, instance)
+        return instance
+
+
+# (model version or updated_at, instance) pair held by SiteSettings.load()
+_site_settings_cache = (None, None)
 
 
 class ContactForm(models.Model):
@@ -58,6 +112,11 @@ class ContactForm(models.Model):
     
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            # Backs keyset pagination on (submitted_at, id)
+            models.Index(fields=['-submitted_at', '-id'], name='contactform_submitted_id_idx'),
+            models.Index(fields=['status', '-submitted_at'], name='contactform_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.submitted_at.strftime('%Y-%m-%d %H:%M')}"
@@ -79,6 +138,15 @@ class Review(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='review_created_id_idx'),
+            # Partial indexes for the public and featured (homepage) lists
+            models.Index(fields=['-created_at'], name='review_approved_idx', condition=models.Q(is_approved=True)),
+            models.Index(
+                fields=['-created_at'], name='review_featured_idx',
+                condition=models.Q(is_featured=True, is_approved=True),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.author_name} - {self.rating} stars"
@@ -91,6 +159,7 @@ class Program(models.Model):
     duration = models.CharField(max_length=100, blank=True, help_text="e.g., '30 days', '90 days'")
     features = models.JSONField(default=list, help_text="List of program features")
     image = models.ImageField(upload_to='programs/', null=True, blank=True)
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of the image, filled in by api.images")
     is_active = models.BooleanField(default=True)
     order = models.IntegerField(default=0, help_text="Display order")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -98,6 +167,10 @@ class Program(models.Model):
     
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            # Public list of active programs
+            models.Index(fields=['order', 'name'], name='program_active_idx', condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return self.name
@@ -110,6 +183,7 @@ class Housing(models.Model):
     capacity = models.IntegerField(null=True, blank=True)
     amenities = models.JSONField(default=list, help_text="List of amenities")
     image = models.ImageField(upload_to='housing/', null=True, blank=True)
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of the image, filled in by api.images")
     is_available = models.BooleanField(default=True)
     order = models.IntegerField(default=0, help_text="Display order")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -118,6 +192,10 @@ class Housing(models.Model):
     class Meta:
         ordering = ['order', 'name']
         verbose_name_plural = "Housing Options"
+        indexes = [
+            # Public list of available housing
+            models.Index(fields=['order', 'name'], name='housing_available_idx', condition=models.Q(is_available=True)),
+        ]
     
     def __str__(self):
         return self.name
@@ -136,6 +214,10 @@ class AmazonWishList(models.Model):
     class Meta:
         ordering = ['order', 'name']
         verbose_name_plural = "Amazon Wish Lists"
+        indexes = [
+            # Public list of active wish lists
+            models.Index(fields=['order', 'name'], name='wishlist_active_idx', condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return self.name
@@ -152,6 +234,11 @@ class Donor(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='donor_created_id_idx'),
+            # Donor feed
+            models.Index(fields=['-created_at'], name='donor_featured_idx', condition=models.Q(is_featured=True)),
+        ]
     
     def __str__(self):
         display_name = "Anonymous" if self.is_anonymous else self.name
@@ -199,6 +286,45 @@ class HousingApplication(models.Model):
     class Meta:
         ordering = ['-submitted_at']
         verbose_name_plural = "Housing Applications"
+        indexes = [
+            models.Index(fields=['-submitted_at', '-id'], name='housingapp_submitted_id_idx'),
+            models.Index(fields=['status', '-submitted_at'], name='housingapp_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.submitted_at.strftime('%Y-%m-%d')}"
+
+
+class QueuedSubmission(models.Model):
+    """Public form submission waiting to be saved and post-processed by process_submissions"""
+    KIND_CHOICES = [
+        ('contact_form', 'Contact Form'),
+        ('housing_application', 'Housing Application'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('dead', 'Dead Letter'),
+    ]
+    
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    payload = models.JSONField(help_text="Submitted form data")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    object_id = models.BigIntegerField(null=True, blank=True, help_text="ID of the saved ContactForm/HousingApplication")
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(help_text="Earliest time the next attempt may run")
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        verbose_name_plural = "Queued Submissions"
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='submission_queue_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} - {self.status}"
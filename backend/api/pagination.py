@@ -0,0 +1,32 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination ordered by the view's ``cursor_ordering``"""
+    ordering = ('-created_at', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, 'cursor_ordering', self.ordering)
+
+
+class OptInKeysetPagination(PageNumberPagination):
+    """Page-number pagination unless the client opts into keyset mode.
+
+    Requests with ``?pagination=cursor`` (or an existing ``cursor`` from a
+    previous keyset page) are paginated by KeysetPagination, which avoids
+    OFFSET scans and the COUNT(*) query and keeps pages stable while new rows
+    arrive. Everything else keeps the existing page-number responses.
+    """
+    mode_query_param = 'pagination'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if request.query_params.get(self.mode_query_param) == 'cursor' or KeysetPagination.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,142 @@
+"""
+Slow, duplicate and N+1 query detection.
+
+QueryDetector wraps every database connection with
+``connection.execute_wrapper`` and fingerprints each statement (Django's SQL
+with placeholders, IN lists collapsed). When it exits it reports:
+
+* ``n+1``       one fingerprint run QUERY_DETECTOR_REPEAT_THRESHOLD or more
+                times with different parameters, the shape of a per-row lookup
+* ``duplicate`` the same statement with the same parameters run again
+* ``slow``      a statement slower than QUERY_DETECTOR_SLOW_MS
+
+Each problem names the view, the first frame of our own code that issued the
+query and, when the query came from serializing a field, that field.
+QueryDetectorMiddleware runs it for every request when settings.QUERY_DETECTOR
+is 'log' (production: warnings on the api.queries logger) or 'raise' (tests:
+the request fails with QueryProblemsDetected).
+"""
+import logging
+import os
+import re
+import sys
+import time
+from contextlib import ExitStack
+
+import django
+import rest_framework
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('api.queries')
+
+MODES = ('off', 'log', 'raise')
+
+IN_LIST_RE = re.compile(r'\bIN \((?:%s, )*%s\)', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Frames from these packages, and from the execute wrappers and middleware
+# around every query, are skipped when looking for the query's origin
+LIBRARY_PATHS = tuple(os.path.dirname(module.__file__) + os.sep for module in (django, rest_framework)) + (
+    __file__,
+    os.path.join(os.path.dirname(__file__), 'metrics.py'),
+    os.path.join(os.path.dirname(__file__), 'middleware.py'),
+)
+
+
+class QueryProblemsDetected(AssertionError):
+    """Raised in 'raise' mode when a request ran problem queries"""
+
+
+def fingerprint(sql):
+    return IN_LIST_RE.sub('IN (...)', WHITESPACE_RE.sub(' ', sql).strip())
+
+
+def find_origin():
+    """(code location, serializer field) that issued the current query"""
+    location = field = None
+    frame = sys._getframe(2)
+    while frame is not None and (location is None or field is None):
+        code = frame.f_code
+        if field is None and code.co_name == 'to_representation':
+            candidate = frame.f_locals.get('field')
+            if candidate is not None and getattr(candidate, 'parent', None) is not None:
+                field = f'{type(candidate.parent).__name__}.{candidate.field_name}'
+        if location is None and not code.co_filename.startswith(LIBRARY_PATHS):
+            filename = os.path.relpath(code.co_filename, settings.BASE_DIR)
+            location = f'{filename}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return location, field
+
+
+class QueryDetector:
+    """Context manager collecting the problem queries run inside it"""
+
+    def __init__(self, label='', slow_ms=None, repeat_threshold=None):
+        self.label = label
+        self.slow_ms = settings.QUERY_DETECTOR_SLOW_MS if slow_ms is None else slow_ms
+        self.repeat_threshold = settings.QUERY_DETECTOR_REPEAT_THRESHOLD if repeat_threshold is None else repeat_threshold
+        # fingerprint -> {'params': {repr(params): count}, 'origin': (location, field)}
+        self.statements = {}
+        self.slow = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            key = fingerprint(sql)
+            entry = self.statements.get(key)
+            if entry is None:
+                entry = self.statements[key] = {'params': {}, 'origin': find_origin()}
+            params_key = repr(params)
+            entry['params'][params_key] = entry['params'].get(params_key, 0) + 1
+            if elapsed_ms > self.slow_ms:
+                self.slow.append((key, elapsed_ms, find_origin()))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        return False
+
+    def problems(self):
+        found = []
+        for key, entry in self.statements.items():
+            location, field = entry['origin']
+            total = sum(entry['params'].values())
+            if len(entry['params']) >= self.repeat_threshold:
+                found.append({'kind': 'n+1', 'sql': key, 'count': total, 'location': location, 'field': field})
+            repeats = sum(count - 1 for count in entry['params'].values())
+            if repeats:
+                found.append({'kind': 'duplicate', 'sql': key, 'count': repeats + 1, 'location': location, 'field': field})
+        for key, elapsed_ms, (location, field) in self.slow:
+            found.append({'kind': 'slow', 'sql': key, 'ms': round(elapsed_ms, 1), 'location': location, 'field': field})
+        return found
+
+    def describe(self, problem):
+        where = ', '.join(part for part in (
+            self.label and f'view {self.label}',
+            problem['field'] and f"field {problem['field']}",
+            problem['location'] and f"at {problem['location']}",
+        ) if part)
+        amount = f"{problem['ms']} ms" if problem['kind'] == 'slow' else f"{problem['count']} times"
+        return f"{problem['kind']} query ({amount}; {where}): {problem['sql']}"
+
+    def report(self, mode):
+        """Log or raise the problems found; returns them"""
+        found = self.problems()
+        if not found:
+            return found
+        messages = [self.describe(problem) for problem in found]
+        if mode == 'raise':
+            raise QueryProblemsDetected('\n'.join(messages))
+        for message in messages:
+            logger.warning(message)
+        return found
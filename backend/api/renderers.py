@@ -0,0 +1,82 @@
+"""
+JSON renderer and parser with a pluggable encoding backend.
+
+settings.JSON_BACKEND selects the library: 'orjson' when it is installed,
+'stdlib' for DRF's json-based implementation, or 'auto' (the default) to use
+orjson if available and fall back to stdlib otherwise. Types orjson does not
+encode the way DRF does (Decimal, date, time, datetime) are passed to DRF's
+own JSONEncoder, so both backends produce the same output.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .metrics import timed
+
+# Try to import orjson (optional), fallback to the stdlib json backend
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+BACKENDS = ('auto', 'orjson', 'stdlib')
+
+
+def get_backend():
+    backend = getattr(settings, 'JSON_BACKEND', 'auto')
+    if backend not in BACKENDS:
+        raise ValueError(f"JSON_BACKEND must be one of {', '.join(BACKENDS)}, not {backend!r}")
+    if backend == 'auto':
+        return 'orjson' if orjson is not None else 'stdlib'
+    if backend == 'orjson' and orjson is None:
+        raise ImportError("JSON_BACKEND is 'orjson' but orjson is not installed")
+    return backend
+
+
+_encoder = JSONEncoder()
+
+
+def orjson_dumps(data):
+    """Encode like DRF's compact, unicode JSONRenderer output"""
+    ret = orjson.dumps(
+        data, default=_encoder.default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+    )
+    # Match DRF: fully escape U+2028/U+2029 so the output is a strict JavaScript subset
+    return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when the backend allows it"""
+
+    @timed('render')
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Pretty printing (browsable API, ?indent) and non-default DRF JSON
+        # settings keep the stdlib path
+        if (
+            get_backend() == 'orjson'
+            and self.compact and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        ):
+            return orjson_dumps(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes with orjson when the backend allows it"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        # orjson only reads UTF-8 and always rejects NaN/Infinity
+        if get_backend() != 'orjson' or encoding.lower().replace('_', '-') != 'utf-8' or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.conf import settings
+from .images import SrcsetField
 from .models import ContactForm, Review, Program, Housing, SiteSettings, AmazonWishList, Donor, HousingApplication
 
 
@@ -26,28 +27,52 @@ class PublicReviewSerializer(serializers.ModelSerializer):
 
 
 class ProgramSerializer(serializers.ModelSerializer):
+    image_srcset = SrcsetField(source='image_derivatives')
+    
     class Meta:
         model = Program
-        fields = ['id', 'name', 'description', 'duration', 'features', 'image', 
+        fields = ['id', 'name', 'description', 'duration', 'features', 'image', 'image_srcset',
                   'is_active', 'order', 'created_at', 'updated_at']
+        load_fields = ['id', 'name', 'description', 'duration', 'features', 'image', 'image_derivatives',
+                       'is_active', 'order', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
 
 
+class ProgramSummarySerializer(serializers.ModelSerializer):
+    """Compact program listing without description or features (?summary)"""
+    class Meta:
+        model = Program
+        fields = ['id', 'name', 'duration', 'image', 'is_active', 'order']
+
+
 class HousingSerializer(serializers.ModelSerializer):
+    image_srcset = SrcsetField(source='image_derivatives')
+    
     class Meta:
         model = Housing
-        fields = ['id', 'name', 'description', 'capacity', 'amenities', 'image', 
+        fields = ['id', 'name', 'description', 'capacity', 'amenities', 'image', 'image_srcset',
                   'is_available', 'order', 'created_at', 'updated_at']
+        load_fields = ['id', 'name', 'description', 'capacity', 'amenities', 'image', 'image_derivatives',
+                       'is_available', 'order', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
 
 
+class HousingSummarySerializer(serializers.ModelSerializer):
+    """Compact housing listing without description or amenities (?summary)"""
+    class Meta:
+        model = Housing
+        fields = ['id', 'name', 'capacity', 'image', 'is_available', 'order']
+
+
 class SiteSettingsSerializer(serializers.ModelSerializer):
     background_image = serializers.ImageField(required=False, allow_null=True)
+    background_image_srcset = SrcsetField(source='background_image_derivatives')
     
     class Meta:
         model = SiteSettings
         fields = ['site_name', 'primary_color', 'secondary_color', 'accent_color', 
-                  'background_color', 'empty_state_color', 'background_image', 'hero_title', 'hero_subtitle',
+                  'background_color', 'empty_state_color', 'background_image', 'background_image_srcset',
+                  'hero_title', 'hero_subtitle',
                   'mission', 'about_content', 'contact_email', 'contact_phone', 'address',
                   'facebook_url', 'instagram_url', 'twitter_url', 'linkedin_url', 
                   'youtube_url', 'tiktok_url']
@@ -124,6 +149,8 @@ class PublicDonorSerializer(serializers.ModelSerializer):
         model = Donor
         fields = ['id', 'display_name', 'amount', 'message', 'created_at']
         read_only_fields = ['created_at']
+        # Columns display_name and the other fields are built from
+        load_fields = ['id', 'name', 'is_anonymous', 'amount', 'message', 'created_at']
     
     def get_display_name(self, obj):
         return "Anonymous" if obj.is_anonymous else obj.name
@@ -0,0 +1,30 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from .cache import bump_model_version, model_version_bumped
+from .images import IMAGE_FIELDS, schedule_derivatives
+from .metrics import install_execute_wrapper
+from .snapshots import schedule_rebuild
+from .models import ContactForm, Review, Program, Housing, SiteSettings, AmazonWishList, Donor, HousingApplication
+
+# Models whose version is tracked for the response cache and ETags
+VERSIONED_MODELS = (ContactForm, Review, Program, Housing, SiteSettings, AmazonWishList, Donor, HousingApplication)
+
+
+def invalidate_public_cache(sender, **kwargs):
+    """Drop cached responses and validators built from the changed model"""
+    bump_model_version(sender)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(invalidate_public_cache, sender=model, dispatch_uid=f'invalidate_public_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_public_cache, sender=model, dispatch_uid=f'invalidate_public_cache_delete_{model.__name__}')
+
+# Resized copies of uploaded images are generated after the row is committed
+for model, field_name in IMAGE_FIELDS:
+    post_save.connect(schedule_derivatives, sender=model, dispatch_uid=f'image_derivatives_{model.__name__}')
+
+# Per-request database timings (api.metrics)
+connection_created.connect(install_execute_wrapper, dispatch_uid='install_execute_wrapper')
+
+# Precomputed public snapshots are rebuilt after any version bump (api.snapshots)
+model_version_bumped.connect(schedule_rebuild, dispatch_uid='rebuild_public_snapshots')
@@ -0,0 +1,334 @@
+"""
+Precomputed snapshots of the public read endpoints.
+
+With settings.PUBLIC_SNAPSHOTS set to 'file' or 'cache', each endpoint in
+api.async_views.PUBLIC_ENDPOINTS is rendered once through its DRF view, as an
+anonymous JSON GET for PUBLIC_SNAPSHOT_BASE_URL, and stored with gzip (and
+Brotli, when installed) copies and the view's headers.
+api.middleware.PublicSnapshotMiddleware answers matching requests from the
+snapshot before sessions, authentication or URL resolution run, including
+304s for the view's own ETag and Last-Modified.
+
+Every bump_model_version() (saves, deletes, bulk writes, imports, image
+derivatives) rebuilds the snapshots built from that model once the
+transaction commits, each snapshot once however many rows changed. A snapshot is replaced whole, so readers get the old
+one or the new one, never a mix:
+
+* ``file``  each build is written to its own directory under
+            PUBLIC_SNAPSHOT_ROOT, then a symlink named after the endpoint is
+            swapped to it with os.replace(). Fine for one machine; other
+            replicas would keep serving what they built themselves.
+* ``cache`` one key per snapshot in the default cache, expiring after
+            PUBLIC_CACHE_TIMEOUT. Use a shared backend (Redis) with several
+            replicas.
+
+If a build fails the snapshot is dropped and its path goes back to the view.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+
+from .async_views import PUBLIC_ENDPOINTS
+from .cache import acache
+
+# Brotli is optional; without it snapshots only get a gzip copy
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MODES = ('', 'file', 'cache')
+SNAPSHOT_KEY_PREFIX = 'api:snapshot:'
+
+# Content codings in order of preference, with their file suffix
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Headers kept on a 304, as Django's ConditionalGetMiddleware does
+NOT_MODIFIED_HEADERS = ('Cache-Control', 'Content-Location', 'ETag', 'Expires', 'Last-Modified', 'Vary')
+
+# URL names of the snapshotted endpoints and the models each is built from
+SNAPSHOT_MODELS = {name: endpoint.models for route, name, endpoint in PUBLIC_ENDPOINTS}
+
+# Snapshots whose last build failed in this process. Requests don't retry
+# them; the next bump_model_version() of one of their models does.
+_failed = set()
+
+# Snapshots to rebuild when the current transaction commits, per thread, so
+# deleting N rows rebuilds each affected snapshot once rather than N times
+_pending = threading.local()
+
+
+class SnapshotError(Exception):
+    """Raised when an endpoint can't be snapshotted"""
+
+
+class Snapshot:
+    """A rendered response body, its compressed copies and the view's headers"""
+    __slots__ = ('body', 'headers', 'encoded')
+
+    def __init__(self, body, headers, encoded=None):
+        self.body = body
+        self.headers = headers
+        self.encoded = compress(body) if encoded is None else encoded
+
+    def response(self, request):
+        """The snapshot as a response to ``request``, or a 304"""
+        last_modified = self.headers.get('Last-Modified')
+        response = get_conditional_response(
+            request, etag=self.headers.get('ETag'),
+            last_modified=last_modified and parse_http_date_safe(last_modified),
+        )
+        if response is not None:
+            for header in NOT_MODIFIED_HEADERS:
+                if header in self.headers:
+                    response[header] = self.headers[header]
+        else:
+            body, coding = self.body, None
+            accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+            for name, _ in ENCODINGS:
+                if name in self.encoded and re.search(rf'\b{name}\b', accept_encoding):
+                    body, coding = self.encoded[name], name
+                    break
+            response = HttpResponse(body)
+            for header, value in self.headers.items():
+                response[header] = value
+            if coding is not None:
+                response['Content-Encoding'] = coding
+            # Middleware after this one (CommonMiddleware) never sees the response
+            response['Content-Length'] = str(len(body))
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+
+def compress(body):
+    """{content coding: compressed body}, keeping only copies smaller than ``body``"""
+    encoded = {'gzip': gzip.compress(body, 9, mtime=0)}
+    if brotli is not None:
+        encoded['br'] = brotli.compress(body)
+    return {name: data for name, data in encoded.items() if len(data) < len(body)}
+
+
+class FileSnapshotStorage:
+    """Snapshots as files under ``root``.
+
+    ``<name>`` is a symlink to the directory of the current build, holding
+    response.json, its .gz/.br copies and meta.json (headers and codings).
+    Each process keeps the snapshot it read until the link changes.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._loaded = {}
+
+    def load(self, name):
+        # A rebuild can remove the directory between readlink() and open();
+        # the link then already points at the new one
+        for attempt in range(3):
+            try:
+                target = os.readlink(os.path.join(self.root, name))
+            except OSError:
+                return None
+            loaded = self._loaded.get(name)
+            if loaded is not None and loaded[0] == target:
+                return loaded[1]
+            try:
+                snapshot = self.read(os.path.join(self.root, target))
+            except OSError:
+                continue
+            self._loaded[name] = (target, snapshot)
+            return snapshot
+        return None
+
+    def read(self, directory):
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        with open(os.path.join(directory, 'response.json'), 'rb') as f:
+            body = f.read()
+        encoded = {}
+        for coding, suffix in ENCODINGS:
+            if coding in meta['encodings']:
+                with open(os.path.join(directory, 'response.json' + suffix), 'rb') as f:
+                    encoded[coding] = f.read()
+        return Snapshot(body, meta['headers'], encoded)
+
+    async def aload(self, name):
+        # A readlink per request; files are only read after a rebuild
+        return self.load(name)
+
+    def save(self, name, snapshot):
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha1(snapshot.body)
+        digest.update(json.dumps(snapshot.headers, sort_keys=True).encode())
+        target = f'.{name}.{digest.hexdigest()[:16]}'
+        link = os.path.join(self.root, name)
+        try:
+            previous = os.readlink(link)
+        except OSError:
+            previous = None
+        if previous == target:
+            return
+        directory = os.path.join(self.root, target)
+        if not os.path.isdir(directory):
+            staging = tempfile.mkdtemp(prefix=f'.{name}.tmp-', dir=self.root)
+            # mkdtemp() is private to us; a front server may read these too
+            os.chmod(staging, 0o755)
+            with open(os.path.join(staging, 'response.json'), 'wb') as f:
+                f.write(snapshot.body)
+            for coding, suffix in ENCODINGS:
+                if coding in snapshot.encoded:
+                    with open(os.path.join(staging, 'response.json' + suffix), 'wb') as f:
+                        f.write(snapshot.encoded[coding])
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump({'headers': snapshot.headers, 'encodings': sorted(snapshot.encoded)}, f)
+            try:
+                os.rename(staging, directory)
+            except OSError:
+                # Another process just wrote the same build
+                shutil.rmtree(staging, ignore_errors=True)
+        staging_link = os.path.join(self.root, f'.{name}.link-{os.getpid()}-{id(snapshot)}')
+        os.symlink(target, staging_link)
+        os.replace(staging_link, link)
+        if previous is not None:
+            shutil.rmtree(os.path.join(self.root, previous), ignore_errors=True)
+
+    def delete(self, name):
+        link = os.path.join(self.root, name)
+        try:
+            target = os.readlink(link)
+            os.remove(link)
+        except OSError:
+            return
+        shutil.rmtree(os.path.join(self.root, target), ignore_errors=True)
+
+
+class CacheSnapshotStorage:
+    """Snapshots in the default cache, one key each"""
+
+    def key(self, name):
+        return f'{SNAPSHOT_KEY_PREFIX}{name}'
+
+    def load(self, name):
+        return cache.get(self.key(name))
+
+    async def aload(self, name):
+        return await acache('get', self.key(name))
+
+    def save(self, name, snapshot):
+        # Expires like the response cache, which bounds staleness with a
+        # per-process (LocMem) cache that only the saving process updates
+        cache.set(self.key(name), snapshot, settings.PUBLIC_CACHE_TIMEOUT)
+
+    def delete(self, name):
+        cache.delete(self.key(name))
+
+
+@lru_cache(maxsize=None)
+def _storage(mode, root):
+    return FileSnapshotStorage(root) if mode == 'file' else CacheSnapshotStorage()
+
+
+def get_storage():
+    """Storage for settings.PUBLIC_SNAPSHOTS, or None when snapshots are off"""
+    if not settings.PUBLIC_SNAPSHOTS:
+        return None
+    return _storage(settings.PUBLIC_SNAPSHOTS, settings.PUBLIC_SNAPSHOT_ROOT)
+
+
+def build(name):
+    """Render the public endpoint ``name`` through its DRF view"""
+    path = reverse(name)
+    base_url = urlsplit(settings.PUBLIC_SNAPSHOT_BASE_URL)
+    request = RequestFactory().get(
+        path, secure=base_url.scheme == 'https',
+        headers={'Accept': 'application/json', 'Host': base_url.netloc},
+    )
+    view = resolve(path).func
+    if iscoroutinefunction(view):
+        # The ASYNC_PUBLIC_VIEWS wrapper around the DRF view
+        view = view.__wrapped__
+    response = view(request)
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code != 200:
+        raise SnapshotError(f'{path} answered {response.status_code}')
+    headers = {header: value for header, value in response.items() if header != 'Content-Length'}
+    return Snapshot(response.content, headers)
+
+
+def rebuild(name):
+    """Build and store one snapshot; returns it, or None after dropping it on failure"""
+    storage = get_storage()
+    if storage is None:
+        return None
+    try:
+        snapshot = build(name)
+        storage.save(name, snapshot)
+    except Exception as e:
+        logger.error(f"Building the {name} snapshot failed: {e}", exc_info=True)
+        storage.delete(name)
+        _failed.add(name)
+        return None
+    _failed.discard(name)
+    return snapshot
+
+
+def get_snapshot(name):
+    """The stored snapshot of ``name``, built now if there is none"""
+    snapshot = get_storage().load(name)
+    if snapshot is None and name not in _failed:
+        snapshot = rebuild(name)
+    return snapshot
+
+
+async def aget_snapshot(name):
+    snapshot = await get_storage().aload(name)
+    if snapshot is None and name not in _failed:
+        snapshot = await sync_to_async(rebuild)(name)
+    return snapshot
+
+
+def rebuild_all(names=None):
+    """Rebuild the named snapshots (all by default); returns {name: snapshot or None}"""
+    return {name: rebuild(name) for name in (names or SNAPSHOT_MODELS)}
+
+
+def rebuild_pending():
+    """Rebuild the snapshots scheduled so far; later callbacks of the same commit find none"""
+    names = getattr(_pending, 'names', None)
+    _pending.names = None
+    if names:
+        rebuild_all(names)
+
+
+def schedule_rebuild(sender, **kwargs):
+    """model_version_bumped receiver rebuilding the snapshots built from ``sender``"""
+    if not settings.PUBLIC_SNAPSHOTS:
+        return
+    names = [name for name, models in SNAPSHOT_MODELS.items() if sender in models]
+    if names:
+        if getattr(_pending, 'names', None) is None:
+            _pending.names = set()
+        _pending.names.update(names)
+        # One callback per bump, so names left by a rolled back transaction
+        # are still rebuilt with the next commit
+        transaction.on_commit(rebuild_pending)
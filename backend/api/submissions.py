@@ -0,0 +1,160 @@
+"""
+Queued processing of public form submissions.
+
+With settings.SUBMISSIONS_ASYNC on (off by default), the public submit
+endpoints validate the form, store it as a QueuedSubmission and answer 202
+straight away. That needs `manage.py process_submissions --loop` running as
+a separate worker service, which the Procfile declares but the Railway and
+Nixpacks start commands do not start. The process_submissions
+management command then drains the queue in batches: it re-validates each
+payload, saves the records with one bulk_create per kind and runs the
+post-processing hooks configured in settings.SUBMISSION_HOOKS. Failed hooks
+are retried with exponential backoff until SUBMISSION_MAX_ATTEMPTS, after
+which the submission is left in the 'dead' status for staff to inspect.
+"""
+import logging
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .cache import bump_model_version
+from .models import ContactForm, HousingApplication, QueuedSubmission
+from .serializers import ContactFormSerializer, HousingApplicationSerializer
+
+logger = logging.getLogger(__name__)
+
+KINDS = {
+    'contact_form': (ContactForm, ContactFormSerializer),
+    'housing_application': (HousingApplication, HousingApplicationSerializer),
+}
+
+
+def enqueue(kind, data):
+    """Store a validated submission for the worker"""
+    payload = data.dict() if hasattr(data, 'dict') else dict(data)
+    return QueuedSubmission.objects.create(kind=kind, payload=payload, available_at=timezone.now())
+
+
+@lru_cache(maxsize=None)
+def get_hooks(kind):
+    return [import_string(path) for path in settings.SUBMISSION_HOOKS.get(kind, [])]
+
+
+def log_submission(instance):
+    """Example hook: log every saved submission"""
+    logger.info(f"New {instance._meta.verbose_name} #{instance.pk}: {instance}")
+
+
+def claim_batch(batch_size):
+    """Mark up to batch_size due submissions as processing and return them.
+
+    Submissions claimed by a worker that died are reclaimed after
+    SUBMISSION_CLAIM_TIMEOUT seconds.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.SUBMISSION_CLAIM_TIMEOUT)
+    with transaction.atomic():
+        ids = list(
+            QueuedSubmission.objects.select_for_update(skip_locked=True)
+            .filter(Q(status='pending', available_at__lte=now) | Q(status='processing', claimed_at__lt=stale))
+            .order_by('available_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        QueuedSubmission.objects.filter(id__in=ids).update(status='processing', claimed_at=now)
+    return list(QueuedSubmission.objects.filter(id__in=ids).order_by('id'))
+
+
+def _fail(submission, error, max_attempts, retry=True):
+    submission.attempts += 1
+    submission.last_error = error
+    submission.claimed_at = None
+    if not retry or submission.attempts >= max_attempts:
+        submission.status = 'dead'
+        logger.error(f"Submission #{submission.pk} moved to dead letter: {error}")
+    else:
+        submission.status = 'pending'
+        delay = settings.SUBMISSION_RETRY_DELAY * 2 ** (submission.attempts - 1)
+        submission.available_at = timezone.now() + timedelta(seconds=delay)
+
+
+def process_batch(submissions, max_attempts=None):
+    """Save and post-process claimed submissions; returns counts by outcome"""
+    max_attempts = max_attempts or settings.SUBMISSION_MAX_ATTEMPTS
+    counts = {'done': 0, 'retry': 0, 'dead': 0}
+    by_kind = {}
+    for submission in submissions:
+        by_kind.setdefault(submission.kind, []).append(submission)
+
+    for kind, items in by_kind.items():
+        if kind not in KINDS:
+            for submission in items:
+                _fail(submission, f'Unknown submission kind {kind!r}', max_attempts, retry=False)
+            continue
+        model, serializer_class = KINDS[kind]
+
+        # Submissions retried after a hook failure were already saved
+        to_create = []
+        for submission in items:
+            if submission.object_id is not None:
+                continue
+            serializer = serializer_class(data=submission.payload)
+            if not serializer.is_valid():
+                _fail(submission, f'Invalid payload: {serializer.errors}', max_attempts, retry=False)
+                continue
+            to_create.append((submission, model(**serializer.validated_data)))
+
+        created = {}
+        if to_create:
+            try:
+                with transaction.atomic():
+                    objects = model.objects.bulk_create([instance for _, instance in to_create])
+                    for (submission, _), obj in zip(to_create, objects):
+                        submission.object_id = obj.pk
+                        created[obj.pk] = obj
+                    QueuedSubmission.objects.bulk_update([submission for submission, _ in to_create], ['object_id'])
+            except Exception as e:
+                logger.error(f"Saving {kind} batch failed: {e}", exc_info=True)
+                for submission, _ in to_create:
+                    submission.object_id = None
+                    _fail(submission, f'Save failed: {e}', max_attempts)
+                created = {}
+            # bulk_create sends no post_save, so invalidate cached lists here
+            if created:
+                bump_model_version(model)
+
+        pending_hooks = [s for s in items if s.object_id is not None and s.status == 'processing']
+        missing = [s.object_id for s in pending_hooks if s.object_id not in created]
+        if missing:
+            created.update(model.objects.in_bulk(missing))
+        for submission in pending_hooks:
+            instance = created.get(submission.object_id)
+            if instance is None:
+                _fail(submission, f'{model.__name__} #{submission.object_id} no longer exists', max_attempts, retry=False)
+                continue
+            try:
+                for hook in get_hooks(kind):
+                    hook(instance)
+            except Exception as e:
+                logger.warning(f"Hook failed for submission #{submission.pk}: {e}", exc_info=True)
+                _fail(submission, f'Hook failed: {e}', max_attempts)
+                continue
+            submission.status = 'done'
+            submission.claimed_at = None
+            submission.processed_at = timezone.now()
+
+    for submission in submissions:
+        if submission.status == 'done':
+            counts['done'] += 1
+        elif submission.status == 'dead':
+            counts['dead'] += 1
+        else:
+            counts['retry'] += 1
+    QueuedSubmission.objects.bulk_update(
+        submissions, ['status', 'attempts', 'last_error', 'object_id', 'available_at', 'claimed_at', 'processed_at']
+    )
+    return counts
@@ -0,0 +1,11 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class QueryCountTests(TestCase):
+    def test_endpoints_run_constant_queries(self):
+        # Raises CommandError, failing the test, on an endpoint whose query
+        # count grows with its rows or repeats a query
+        call_command('check_query_counts', stdout=StringIO())
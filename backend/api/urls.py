@@ -1,9 +1,10 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     ContactFormViewSet, ReviewViewSet, ProgramViewSet,
     HousingViewSet, SiteSettingsViewSet, AmazonWishListViewSet, DonorViewSet,
-    HousingApplicationViewSet
+    HousingApplicationViewSet, HomepageView, DashboardView
 )
 
 router = DefaultRouter()
@@ -16,6 +17,23 @@ router.register(r'wishlists', AmazonWishListViewSet, basename='wishlist')
 router.register(r'donors', DonorViewSet, basename='donor')
 router.register(r'housing-applications', HousingApplicationViewSet, basename='housingapplication')
 
+homepage_view = HomepageView.as_view()
+
 urlpatterns = [
+    path('homepage/', homepage_view, name='homepage'),
+    path('dashboard/', DashboardView.as_view(), name='dashboard'),
     path('', include(router.urls)),
 ]
+
+if settings.ASYNC_PUBLIC_VIEWS:
+    from .async_views import PUBLIC_ENDPOINTS
+
+    sync_views = {'homepage': homepage_view}
+    for pattern in router.urls:
+        # The first pattern of each name is the one without a format suffix
+        sync_views.setdefault(pattern.name, pattern.callback)
+    # Listed first so they take over the public GETs of the routes below
+    urlpatterns = [
+        path(route, endpoint.as_view(sync_views[name]), name=name)
+        for route, name, endpoint in PUBLIC_ENDPOINTS
+    ] + urlpatterns
@@ -1,20 +1,40 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, SAFE_METHODS
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
 from django.shortcuts import get_object_or_404
+from .bulk import BulkMixin
+from .cache import cache_public_response, get_model_versions, shared_cache
+from .conditional import ConditionalGetMixin
+from .exports import ExportMixin
+from .fast_serializers import ValuesListMixin, get_values_serializer
+from .pagination import OptInKeysetPagination
+from .submissions import enqueue
 from .models import ContactForm, Review, Program, Housing, SiteSettings, AmazonWishList, Donor, HousingApplication
 from .serializers import (
     ContactFormSerializer, ReviewSerializer, PublicReviewSerializer,
     ProgramSerializer, HousingSerializer, SiteSettingsSerializer,
     AmazonWishListSerializer, DonorSerializer, PublicDonorSerializer,
-    HousingApplicationSerializer
+    HousingApplicationSerializer, ProgramSummarySerializer, HousingSummarySerializer
 )
 
 
-class ContactFormViewSet(viewsets.ModelViewSet):
+def project(queryset, serializer_class):
+    """Load only the columns a serializer reads (Meta.load_fields, else Meta.fields)"""
+    meta = serializer_class.Meta
+    return queryset.only(*getattr(meta, 'load_fields', meta.fields))
+
+
+class ContactFormViewSet(ConditionalGetMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = ContactForm.objects.all()
     serializer_class = ContactFormSerializer
+    pagination_class = OptInKeysetPagination
+    cursor_ordering = ('-submitted_at', '-id')
+    timestamp_field = 'submitted_at'
     
     def get_permissions(self):
         # Allow public access for create and submit actions
@@ -31,13 +51,19 @@ class ContactFormViewSet(viewsets.ModelViewSet):
         """Public endpoint for submitting contact forms"""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
+        if settings.SUBMISSIONS_ASYNC:
+            # Saved and post-processed by the process_submissions worker
+            submission = enqueue('contact_form', request.data)
+            return Response({'id': submission.pk, 'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, BulkMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    pagination_class = OptInKeysetPagination
+    cursor_ordering = ('-created_at', '-id')
     
     def get_permissions(self):
         # Allow public access for list with public param, and for custom actions
@@ -60,29 +86,35 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return ReviewSerializer
     
     def get_queryset(self):
+        if self.action == 'public':
+            return project(Review.objects.filter(is_approved=True), PublicReviewSerializer)
+        if self.action == 'featured':
+            return project(Review.objects.filter(is_featured=True, is_approved=True), PublicReviewSerializer)
         queryset = Review.objects.all()
         if 'public' in self.request.query_params:
             queryset = queryset.filter(is_approved=True)
         if 'featured' in self.request.query_params:
             queryset = queryset.filter(is_featured=True, is_approved=True)
+        if self.action == 'list' and 'public' in self.request.query_params:
+            queryset = project(queryset, PublicReviewSerializer)
         return queryset
     
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @cache_public_response(Review)
     def public(self, request):
         """Public endpoint for viewing approved reviews"""
-        reviews = Review.objects.filter(is_approved=True)
-        serializer = PublicReviewSerializer(reviews, many=True)
-        return Response(serializer.data)
+        reviews = self.get_queryset()
+        return Response(get_values_serializer(PublicReviewSerializer).serialize(reviews, request))
     
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @cache_public_response(Review)
     def featured(self, request):
         """Public endpoint for featured reviews (homepage)"""
-        reviews = Review.objects.filter(is_featured=True, is_approved=True)
-        serializer = PublicReviewSerializer(reviews, many=True)
-        return Response(serializer.data)
+        reviews = self.get_queryset()
+        return Response(get_values_serializer(PublicReviewSerializer).serialize(reviews, request))
 
 
-class ProgramViewSet(viewsets.ModelViewSet):
+class ProgramViewSet(ConditionalGetMixin, BulkMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Program.objects.filter(is_active=True)
     serializer_class = ProgramSerializer
     
@@ -91,13 +123,27 @@ class ProgramViewSet(viewsets.ModelViewSet):
             return [AllowAny()]
         return [IsAuthenticated()]
     
+    def get_serializer_class(self):
+        if self.action == 'list' and 'summary' in self.request.query_params:
+            return ProgramSummarySerializer
+        return ProgramSerializer
+    
     def get_queryset(self):
         if hasattr(self.request.user, 'is_authenticated') and self.request.user.is_authenticated:
-            return Program.objects.all()
-        return Program.objects.filter(is_active=True)
+            queryset = Program.objects.all()
+        else:
+            queryset = Program.objects.filter(is_active=True)
+        if self.action == 'list':
+            # Skip the large description and JSON columns the summary never shows
+            queryset = project(queryset, self.get_serializer_class())
+        return queryset
+    
+    @cache_public_response(Program)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
 
-class HousingViewSet(viewsets.ModelViewSet):
+class HousingViewSet(ConditionalGetMixin, BulkMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Housing.objects.filter(is_available=True)
     serializer_class = HousingSerializer
     
@@ -106,25 +152,45 @@ class HousingViewSet(viewsets.ModelViewSet):
             return [AllowAny()]
         return [IsAuthenticated()]
     
+    def get_serializer_class(self):
+        if self.action == 'list' and 'summary' in self.request.query_params:
+            return HousingSummarySerializer
+        return HousingSerializer
+    
     def get_queryset(self):
         if hasattr(self.request.user, 'is_authenticated') and self.request.user.is_authenticated:
-            return Housing.objects.all()
-        return Housing.objects.filter(is_available=True)
+            queryset = Housing.objects.all()
+        else:
+            queryset = Housing.objects.filter(is_available=True)
+        if self.action == 'list':
+            # Skip the large description and JSON columns the summary never shows
+            queryset = project(queryset, self.get_serializer_class())
+        return queryset
+    
+    @cache_public_response(Housing)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
 
-class SiteSettingsViewSet(viewsets.ModelViewSet):
+class SiteSettingsViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = SiteSettings.objects.all()
     serializer_class = SiteSettingsSerializer
-    
     def get_permissions(self):
         if self.action in ['retrieve', 'public']:
             return [AllowAny()]
         return [IsAuthenticated()]
     
     def get_object(self):
+        # Reads share the cached singleton; writes get their own instance to modify
+        if self.request.method in SAFE_METHODS:
+            return SiteSettings.load()
         obj, created = SiteSettings.objects.get_or_create(pk=1)
         return obj
     
+    def get_validator_queryset(self):
+        # Every URL resolves to the singleton regardless of the pk requested
+        return SiteSettings.objects.filter(pk=1)
+    
     def update(self, request, *args, **kwargs):
         """Handle PUT/PATCH requests"""
         instance = self.get_object()
@@ -137,14 +203,15 @@ class SiteSettingsViewSet(viewsets.ModelViewSet):
         serializer.save()
     
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @cache_public_response(SiteSettings)
     def public(self, request):
         """Public endpoint for site settings"""
-        settings_obj, created = SiteSettings.objects.get_or_create(pk=1)
+        settings_obj = SiteSettings.load()
         serializer = self.get_serializer(settings_obj, context={'request': request})
         return Response(serializer.data)
 
 
-class AmazonWishListViewSet(viewsets.ModelViewSet):
+class AmazonWishListViewSet(ConditionalGetMixin, BulkMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = AmazonWishList.objects.filter(is_active=True)
     serializer_class = AmazonWishListSerializer
     
@@ -157,11 +224,19 @@ class AmazonWishListViewSet(viewsets.ModelViewSet):
         if hasattr(self.request.user, 'is_authenticated') and self.request.user.is_authenticated:
             return AmazonWishList.objects.all()
         return AmazonWishList.objects.filter(is_active=True)
+    
+    @cache_public_response(AmazonWishList)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
 
-class DonorViewSet(viewsets.ModelViewSet):
+class DonorViewSet(ConditionalGetMixin, BulkMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Donor.objects.filter(is_featured=True)
     serializer_class = DonorSerializer
+    pagination_class = OptInKeysetPagination
+    cursor_ordering = ('-created_at', '-id')
+    # Donors have no updated_at; edits are still caught by the model version
+    timestamp_field = 'created_at'
     
     def get_permissions(self):
         if self.action in ['list', 'retrieve', 'feed']:
@@ -174,21 +249,38 @@ class DonorViewSet(viewsets.ModelViewSet):
         return DonorSerializer
     
     def get_queryset(self):
+        if self.action == 'feed':
+            return project(Donor.objects.filter(is_featured=True).order_by('-created_at'), PublicDonorSerializer)
         if hasattr(self.request.user, 'is_authenticated') and self.request.user.is_authenticated:
             return Donor.objects.all()
-        return Donor.objects.filter(is_featured=True).order_by('-created_at')
+        queryset = Donor.objects.filter(is_featured=True).order_by('-created_at')
+        if self.action == 'list':
+            queryset = project(queryset, PublicDonorSerializer)
+        return queryset
     
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @cache_public_response(Donor)
     def feed(self, request):
         """Public endpoint for donor news feed (homepage)"""
-        donors = Donor.objects.filter(is_featured=True).order_by('-created_at')[:20]
-        serializer = PublicDonorSerializer(donors, many=True)
-        return Response(serializer.data)
+        donors = self.get_queryset()[:20]
+        return Response(get_values_serializer(PublicDonorSerializer).serialize(donors, request))
 
 
-class HousingApplicationViewSet(viewsets.ModelViewSet):
-    queryset = HousingApplication.objects.all()
+class HousingApplicationViewSet(ConditionalGetMixin, ExportMixin, viewsets.ModelViewSet):
+    # preferred_housing_name reads the related row; join it instead of one query
+    # per application, skipping the housing columns the serializer never reads
+    queryset = HousingApplication.objects.select_related('preferred_housing').defer(
+        'preferred_housing__description', 'preferred_housing__amenities'
+    )
     serializer_class = HousingApplicationSerializer
+    pagination_class = OptInKeysetPagination
+    cursor_ordering = ('-submitted_at', '-id')
+    timestamp_field = 'submitted_at'
+    # The housing name comes from a join in the export query itself
+    export_fields = {
+        name: 'preferred_housing__name' if name == 'preferred_housing_name' else name
+        for name in HousingApplicationSerializer.Meta.fields
+    }
     
     def get_permissions(self):
         # Allow public access for create and submit actions
@@ -205,5 +297,114 @@ class HousingApplicationViewSet(viewsets.ModelViewSet):
         """Public endpoint for submitting housing applications"""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
+        if settings.SUBMISSIONS_ASYNC:
+            # Saved and post-processed by the process_submissions worker
+            submission = enqueue('housing_application', request.data)
+            return Response({'id': submission.pk, 'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class HomepageView(APIView):
+    """Public bundle of everything the homepage renders, in one response"""
+    # Public data only, so skip Firebase token verification entirely
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    
+    @cache_public_response(SiteSettings, Review, Donor, Program, Housing)
+    def get(self, request):
+        context = {'request': request}
+        return Response({
+            'settings': SiteSettingsSerializer(SiteSettings.load(), context=context).data,
+            'featured_reviews': get_values_serializer(PublicReviewSerializer).serialize(
+                Review.objects.filter(is_featured=True, is_approved=True), request
+            ),
+            'donor_feed': get_values_serializer(PublicDonorSerializer).serialize(
+                Donor.objects.filter(is_featured=True).order_by('-created_at')[:20], request
+            ),
+            'programs': get_values_serializer(ProgramSerializer).serialize(Program.objects.filter(is_active=True), request),
+            'housing': get_values_serializer(HousingSerializer).serialize(Housing.objects.filter(is_available=True), request),
+        })
+
+
+class DashboardView(APIView):
+    """Admin dashboard summary: counts, donation totals and the newest rows of each table"""
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', settings.REST_FRAMEWORK['PAGE_SIZE'])), 1), 100)
+        except ValueError:
+            limit = settings.REST_FRAMEWORK['PAGE_SIZE']
+        # Cached per admin; any write to a listed model changes the key. A
+        # per-process cache would miss other workers' writes, so it is skipped.
+        if not shared_cache():
+            return Response(self.build_summary(request, limit))
+        models = [ContactForm, Review, Program, Housing, AmazonWishList, Donor, HousingApplication]
+        versions = '.'.join(str(version) for version in get_model_versions(models))
+        cache_key = f'api:dashboard:{request.user.uid}:{limit}:{versions}:{request.build_absolute_uri(request.path)}'
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.build_summary(request, limit)
+            cache.set(cache_key, data, settings.DASHBOARD_CACHE_TIMEOUT)
+        return Response(data)
+    
+    def build_summary(self, request, limit):
+        context = {'request': request}
+        
+        def status_counts(model):
+            # One query: total plus a conditional count per status choice
+            aggregates = {'count': Count('pk')}
+            for value, label in model.STATUS_CHOICES:
+                aggregates[value] = Count('pk', filter=Q(status=value))
+            counts = model.objects.aggregate(**aggregates)
+            return {'count': counts.pop('count'), 'by_status': counts}
+        
+        def flag_counts(model, *flags):
+            aggregates = {'count': Count('pk')}
+            for flag in flags:
+                aggregates[flag] = Count('pk', filter=Q(**{flag: True}))
+            return model.objects.aggregate(**aggregates)
+        
+        donors = Donor.objects.aggregate(
+            count=Count('pk'),
+            is_featured=Count('pk', filter=Q(is_featured=True)),
+            is_anonymous=Count('pk', filter=Q(is_anonymous=True)),
+            total_amount=Sum('amount'),
+        )
+        donors['total_amount'] = f"{donors['total_amount'] or 0:.2f}"
+        
+        # Newest rows first; programs, housing and wish lists otherwise
+        # come in their display order
+        return {
+            'contact_forms': {
+                **status_counts(ContactForm),
+                'items': ContactFormSerializer(ContactForm.objects.all()[:limit], many=True).data,
+            },
+            'reviews': {
+                **flag_counts(Review, 'is_approved', 'is_featured'),
+                'items': ReviewSerializer(Review.objects.all()[:limit], many=True).data,
+            },
+            'programs': {
+                **flag_counts(Program, 'is_active'),
+                'items': ProgramSerializer(Program.objects.order_by('-created_at')[:limit], many=True, context=context).data,
+            },
+            'housing': {
+                **flag_counts(Housing, 'is_available'),
+                'items': HousingSerializer(Housing.objects.order_by('-created_at')[:limit], many=True, context=context).data,
+            },
+            'wishlists': {
+                **flag_counts(AmazonWishList, 'is_active'),
+                'items': AmazonWishListSerializer(AmazonWishList.objects.order_by('-created_at')[:limit], many=True).data,
+            },
+            'donors': {
+                **donors,
+                'items': DonorSerializer(Donor.objects.all()[:limit], many=True).data,
+            },
+            'housing_applications': {
+                **status_counts(HousingApplication),
+                'items': HousingApplicationSerializer(
+                    HousingApplication.objects.select_related('preferred_housing')[:limit], many=True
+                ).data,
+            },
+        }
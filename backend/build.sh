@@ -8,4 +8,9 @@ python manage.py migrate --noinput
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+if [ -n "$FIREBASE_KEY_PROVIDER" ]; then
+    echo "Fetching Firebase signing keys..."
+    python manage.py refresh_firebase_keys || echo "Key fetch failed; workers will refresh in the background"
+fi
+
 echo "Build complete!"
@@ -0,0 +1,197 @@
+"""
+Production media serving for local (non-S3) storage.
+
+serve_media answers conditional requests (ETag / Last-Modified) with 304,
+serves single byte ranges with 206, and can hand the file body to the front
+server with X-Sendfile or X-Accel-Redirect (settings.MEDIA_SENDFILE) so large
+images never occupy a Python worker. Stat and MIME lookups are kept in a
+bounded in-process cache for MEDIA_STAT_CACHE_TTL seconds.
+"""
+import mimetypes
+import os
+import re
+import stat
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+class MediaFile:
+    """Stat and MIME details of a media file, as needed to answer a request"""
+    __slots__ = ('path', 'size', 'mtime', 'content_type', 'etag', 'checked_at')
+
+    def __init__(self, path, st):
+        self.path = path
+        self.size = st.st_size
+        self.mtime = int(st.st_mtime)
+        content_type, _ = mimetypes.guess_type(path)
+        self.content_type = content_type or 'application/octet-stream'
+        self.etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+        self.checked_at = time.monotonic()
+
+
+class MediaFileCache:
+    """Bounded LRU cache of MediaFile entries that expire after ``ttl`` seconds"""
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        """Return the cached MediaFile for ``path``, stat'ing it on a miss; None if not a file"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and now - entry.checked_at < self.ttl:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.discard(path)
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        entry = MediaFile(path, st)
+        if self.max_size > 0:
+            with self._lock:
+                self._entries[path] = entry
+                self._entries.move_to_end(path)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def discard(self, path):
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+
+media_cache = MediaFileCache(
+    max_size=getattr(settings, 'MEDIA_STAT_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'MEDIA_STAT_CACHE_TTL', 60),
+)
+
+
+def parse_range(header, size):
+    """Return (start, end) inclusive for a single satisfiable byte range,
+    None to ignore the header, or False if the range can't be satisfied"""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # Malformed or multi-range requests get the whole file
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return False
+    return start, end
+
+
+def if_range_matches(request, media_file):
+    """Whether a Range request should be honoured given its If-Range header"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == media_file.etag
+    return parse_http_date_safe(if_range) == media_file.mtime
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def sendfile_response(media_file, relative_path):
+    """Empty response telling the front server to send the file itself"""
+    response = HttpResponse(content_type=media_file.content_type)
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + quote(relative_path)
+    else:
+        response['X-Sendfile'] = media_file.path
+    return response
+
+
+def serve_media(request, path):
+    """Serve a file from MEDIA_ROOT with conditional, range and sendfile support"""
+    try:
+        file_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("File not found")
+    media_file = media_cache.get(file_path)
+    if media_file is None:
+        raise Http404("File not found")
+
+    response = get_conditional_response(request, etag=media_file.etag, last_modified=media_file.mtime)
+    if response is None:
+        if settings.MEDIA_SENDFILE:
+            response = sendfile_response(media_file, path)
+        else:
+            byte_range = None
+            range_header = request.META.get('HTTP_RANGE')
+            if range_header and if_range_matches(request, media_file):
+                byte_range = parse_range(range_header, media_file.size)
+            if byte_range is False:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{media_file.size}'
+            elif byte_range is not None:
+                start, end = byte_range
+                response = StreamingHttpResponse(
+                    read_range(file_path, start, end - start + 1),
+                    status=206, content_type=media_file.content_type,
+                )
+                response['Content-Length'] = str(end - start + 1)
+                response['Content-Range'] = f'bytes {start}-{end}/{media_file.size}'
+            else:
+                try:
+                    response = FileResponse(open(file_path, 'rb'), content_type=media_file.content_type)
+                except OSError:
+                    # Removed since it was cached
+                    media_cache.discard(file_path)
+                    raise Http404("File not found")
+            response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = media_file.etag
+    response['Last-Modified'] = http_date(media_file.mtime)
+    return response
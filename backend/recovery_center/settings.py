@@ -4,7 +4,7 @@ Django settings for recovery_center project.
 
 from pathlib import Path
 import os
-from decouple import config
+from decouple import config, Csv
 
 # Try to import dj_database_url (for production), fallback to None if not available
 try:
@@ -51,9 +51,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Add whitenoise for static files
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.middleware.WhiteNoiseMiddleware',  # Whitenoise for static files, async-capable for ASGI
+    'api.middleware.PerformanceMiddleware',  # Per-request timings, Server-Timing and /metrics/
+    'api.middleware.QueryDetectorMiddleware',  # Opt-in slow/N+1 query reports (QUERY_DETECTOR)
     'corsheaders.middleware.CorsMiddleware',
+    'api.middleware.PublicSnapshotMiddleware',  # Opt-in precomputed public responses (PUBLIC_SNAPSHOTS)
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -66,6 +69,7 @@ ROOT_URLCONF = 'recovery_center.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'APP_DIRS': True,  # The admin's templates ship inside django.contrib.admin
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -85,7 +89,8 @@ if dj_database_url:
     DATABASES = {
         'default': dj_database_url.config(
             default=config('DATABASE_URL', default=f'sqlite:///{BASE_DIR / "db.sqlite3"}'),
-            conn_max_age=600,
+            # Set to 0 under ASGI, where each request runs its queries in its own thread
+            conn_max_age=config('DB_CONN_MAX_AGE', default=600, cast=int),
             conn_health_checks=True,
         )
     }
@@ -167,6 +172,116 @@ if not USE_S3:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Cache - Use Redis if configured (shared by all workers), otherwise per-process memory
+REDIS_URL = config('REDIS_URL', default=None)
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a cached public API response may be served; saves/deletes of the
+# underlying models invalidate it sooner. Responses are only cached with a
+# shared cache (REDIS_URL): LocMem versions are per process, so a write made
+# by another worker or a management command would never invalidate them.
+PUBLIC_CACHE_TIMEOUT = config('PUBLIC_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds the admin dashboard summary is cached per admin (shared cache only,
+# like the public responses)
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=30, cast=int)
+
+# Opt-in: queue public form submissions (202 {'id', 'status': 'queued'}) for
+# `manage.py process_submissions --loop` to save. Only enable it with that
+# worker deployed as its own service (the Procfile's worker process; the
+# Railway/Nixpacks start commands run the web process only). Off, the submit
+# endpoints save synchronously and answer 201 with the created record.
+SUBMISSIONS_ASYNC = config('SUBMISSIONS_ASYNC', default=False, cast=bool)
+SUBMISSION_MAX_ATTEMPTS = config('SUBMISSION_MAX_ATTEMPTS', default=5, cast=int)
+# Base delay in seconds before a failed submission is retried (doubles each attempt)
+SUBMISSION_RETRY_DELAY = config('SUBMISSION_RETRY_DELAY', default=30, cast=int)
+# Seconds after which a submission claimed by a crashed worker is picked up again
+SUBMISSION_CLAIM_TIMEOUT = config('SUBMISSION_CLAIM_TIMEOUT', default=600, cast=int)
+# Dotted paths of callables run with each saved instance, e.g. api.submissions.log_submission
+SUBMISSION_HOOKS = {
+    'contact_form': config('CONTACT_FORM_HOOKS', default='', cast=Csv()),
+    'housing_application': config('HOUSING_APPLICATION_HOOKS', default='', cast=Csv()),
+}
+
+# Largest list accepted by the bulk/ create, update and delete endpoints
+BULK_MAX_ITEMS = config('BULK_MAX_ITEMS', default=500, cast=int)
+
+# Rows fetched per database round trip by the streaming export endpoints
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Production media serving (local storage only). MEDIA_SENDFILE hands file
+# bodies to the front server: 'x-sendfile' (Apache/lighttpd) sends the
+# absolute path, 'x-accel-redirect' (nginx) sends MEDIA_ACCEL_REDIRECT_PREFIX
+# plus the media path, which must map to an internal location on MEDIA_ROOT
+MEDIA_SENDFILE = config('MEDIA_SENDFILE', default='')
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
+# Media files whose stat/MIME results are cached, and for how many seconds
+MEDIA_STAT_CACHE_SIZE = config('MEDIA_STAT_CACHE_SIZE', default=1024, cast=int)
+MEDIA_STAT_CACHE_TTL = config('MEDIA_STAT_CACHE_TTL', default=60, cast=int)
+
+# Resized copies of uploaded site, program and housing images (see api.images)
+IMAGE_DERIVATIVE_WIDTHS = config('IMAGE_DERIVATIVE_WIDTHS', default='480,960,1600', cast=Csv(int))
+IMAGE_DERIVATIVE_FORMATS = config('IMAGE_DERIVATIVE_FORMATS', default='webp,jpeg', cast=Csv())
+IMAGE_DERIVATIVE_QUALITY = config('IMAGE_DERIVATIVE_QUALITY', default=80, cast=int)
+# Generate on a background thread; False runs it inline after the save commits
+IMAGE_DERIVATIVES_ASYNC = config('IMAGE_DERIVATIVES_ASYNC', default=True, cast=bool)
+
+# Send per-phase request timings to clients in the Server-Timing header
+PERFORMANCE_SERVER_TIMING = config('PERFORMANCE_SERVER_TIMING', default=True, cast=bool)
+# Bearer token Prometheus must send to scrape /metrics/; unset disables the endpoint
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Serve the public read endpoints with the native async views in
+# api.async_views. Only worth it under ASGI (uvicorn
+# recovery_center.asgi:application, with DB_CONN_MAX_AGE=0); under WSGI each
+# async view would run in its own event loop. Compare with benchmark_asgi.
+ASYNC_PUBLIC_VIEWS = config('ASYNC_PUBLIC_VIEWS', default=False, cast=bool)
+
+# Precomputed public responses (api.snapshots): '' (off), 'file' (under
+# PUBLIC_SNAPSHOT_ROOT; one machine) or 'cache' (the default cache; use Redis
+# with several replicas). Snapshots are built for PUBLIC_SNAPSHOT_BASE_URL,
+# e.g. https://api.example.org, and only served to requests for that origin.
+PUBLIC_SNAPSHOTS = config('PUBLIC_SNAPSHOTS', default='')
+PUBLIC_SNAPSHOT_ROOT = config('PUBLIC_SNAPSHOT_ROOT', default=os.path.join(BASE_DIR, 'snapshots'))
+PUBLIC_SNAPSHOT_BASE_URL = config('PUBLIC_SNAPSHOT_BASE_URL', default='')
+
+# Slow/duplicate/N+1 query detection per request: 'off', 'log' (warnings on
+# the api.queries logger) or 'raise' (fail the request; for tests)
+QUERY_DETECTOR = config('QUERY_DETECTOR', default='off')
+QUERY_DETECTOR_SLOW_MS = config('QUERY_DETECTOR_SLOW_MS', default=100, cast=float)
+# Runs of one query shape with different parameters that count as N+1
+QUERY_DETECTOR_REPEAT_THRESHOLD = config('QUERY_DETECTOR_REPEAT_THRESHOLD', default=3, cast=int)
+
+# Log api.* messages (including one JSON line per request from
+# api.middleware.PerformanceMiddleware) to the console
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api': {
+            'handlers': ['console'],
+            'level': config('API_LOG_LEVEL', default='INFO'),
+        },
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -179,9 +294,22 @@ REST_FRAMEWORK = {
         'api.authentication.FirebaseAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20
+    'PAGE_SIZE': 20,
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# JSON library used by the API renderer/parser: 'auto' (orjson if installed),
+# 'orjson' or 'stdlib'
+JSON_BACKEND = config('JSON_BACKEND', default='auto')
+
 # CSRF Trusted Origins
 CSRF_TRUSTED_ORIGINS = [
     'https://cleanandsoberhome.com',
@@ -255,3 +383,24 @@ CORS_ALLOW_HEADERS = [
 
 # Firebase settings
 FIREBASE_CREDENTIALS_PATH = config('FIREBASE_CREDENTIALS_PATH', default='')
+# Maximum number of verified Firebase ID tokens kept in memory per process
+FIREBASE_TOKEN_CACHE_SIZE = config('FIREBASE_TOKEN_CACHE_SIZE', default=1024, cast=int)
+
+# Signing-key provider used to verify Firebase ID tokens locally. Leave empty to
+# let firebase_admin fetch Google's certificates itself. Options:
+#   api.keys.FileKeyProvider   - JSON file at FIREBASE_KEYS_FILE
+#   api.keys.CacheKeyProvider  - Django cache, shared across workers
+#   api.keys.StaticKeyProvider - fixed FIREBASE_STATIC_KEYS (tests/local)
+FIREBASE_KEY_PROVIDER = config('FIREBASE_KEY_PROVIDER', default='')
+FIREBASE_KEYS_FILE = config('FIREBASE_KEYS_FILE', default=os.path.join(BASE_DIR, 'firebase-keys.json'))
+FIREBASE_KEYS_REFRESH_MARGIN = config('FIREBASE_KEYS_REFRESH_MARGIN', default=300, cast=int)
+FIREBASE_STATIC_KEYS = {}
+FIREBASE_PROJECT_ID = config('FIREBASE_PROJECT_ID', default='ndchancerecovery')
+
+# Initialize the Firebase app when Django loads the api app, and warm signing
+# keys when a WSGI/ASGI worker boots, instead of on the first authenticated request
+FIREBASE_INIT_ON_READY = config('FIREBASE_INIT_ON_READY', default=True, cast=bool)
+FIREBASE_WARM_ON_BOOT = config('FIREBASE_WARM_ON_BOOT', default=True, cast=bool)
+# Seconds before a failed initialization is retried, doubling per failure up to the maximum
+FIREBASE_INIT_RETRY_DELAY = config('FIREBASE_INIT_RETRY_DELAY', default=5, cast=float)
+FIREBASE_INIT_RETRY_MAX_DELAY = config('FIREBASE_INIT_RETRY_MAX_DELAY', default=300, cast=float)
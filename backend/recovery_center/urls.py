@@ -5,11 +5,11 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import JsonResponse, FileResponse, Http404
+from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
-from django.views.decorators.cache import cache_control
-import os
-import mimetypes
+from django.views.decorators.cache import cache_control, never_cache
+from api.metrics import has_metrics_token, metrics_view
+from . import media
 
 @require_http_methods(["GET"])
 def api_root(request):
@@ -19,20 +19,31 @@ def api_root(request):
     })
 
 @require_http_methods(["GET"])
+@never_cache
+def health(request):
+    """Process health; Firebase status and cache stats need the METRICS_TOKEN bearer token"""
+    from api.authentication import token_cache
+    from api.firebase import bootstrap
+    firebase_status = bootstrap.status()
+    data = {'status': 'ok' if firebase_status['initialized'] else 'degraded'}
+    if has_metrics_token(request):
+        data.update({
+            'firebase': firebase_status,
+            'token_cache': token_cache.stats(),
+            'media_cache': media.media_cache.stats(),
+        })
+    return JsonResponse(data)
+
+@require_http_methods(["GET", "HEAD"])
 @cache_control(max_age=3600)
 def serve_media(request, path):
     """Serve media files in production"""
-    file_path = os.path.join(settings.MEDIA_ROOT, path)
-    if os.path.exists(file_path) and os.path.isfile(file_path):
-        # Detect content type based on file extension
-        content_type, _ = mimetypes.guess_type(file_path)
-        if not content_type:
-            content_type = 'application/octet-stream'
-        return FileResponse(open(file_path, 'rb'), content_type=content_type)
-    raise Http404("File not found")
+    return media.serve_media(request, path)
 
 urlpatterns = [
     path('', api_root, name='api-root'),
+    path('health/', health, name='health'),
+    path('metrics/', never_cache(metrics_view), name='metrics'),
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
 ]
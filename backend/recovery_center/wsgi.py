@@ -10,3 +10,10 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recovery_center.settings')
 
 application = get_wsgi_application()
 
+# Initialize Firebase and load signing keys before the worker takes traffic
+from django.conf import settings  # noqa: E402
+
+if settings.FIREBASE_WARM_ON_BOOT:
+    from api.firebase import warm_up  # noqa: E402
+    warm_up()
+
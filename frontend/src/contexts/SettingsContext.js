@@ -46,6 +46,7 @@ export const SettingsProvider = ({ children }) => {
 
   const fetchSettings = useCallback(async () => {
     try {
+      // Every page needs the settings; only Home loads the full /homepage/ bundle
       const response = await api.get('/settings/public/');
       setSettings(response.data);
       applyTheme(response.data);
@@ -28,23 +28,15 @@ const Admin = () => {
 
   const fetchAllData = async () => {
     try {
-      const [formsRes, reviewsRes, programsRes, housingRes, wishlistsRes, sponsorsRes, applicationsRes] = await Promise.all([
-        api.get('/contact-forms/'),
-        api.get('/reviews/'),
-        api.get('/programs/'),
-        api.get('/housing/'),
-        api.get('/wishlists/'),
-        api.get('/donors/'),
-        api.get('/housing-applications/'),
-      ]);
-      // Handle paginated responses (DRF returns {results: [...]} when paginated)
-      setContactForms(Array.isArray(formsRes.data) ? formsRes.data : (formsRes.data.results || []));
-      setReviews(Array.isArray(reviewsRes.data) ? reviewsRes.data : (reviewsRes.data.results || []));
-      setPrograms(Array.isArray(programsRes.data) ? programsRes.data : (programsRes.data.results || []));
-      setHousing(Array.isArray(housingRes.data) ? housingRes.data : (housingRes.data.results || []));
-      setWishlists(Array.isArray(wishlistsRes.data) ? wishlistsRes.data : (wishlistsRes.data.results || []));
-      setSponsors(Array.isArray(sponsorsRes.data) ? sponsorsRes.data : (sponsorsRes.data.results || []));
-      setHousingApplications(Array.isArray(applicationsRes.data) ? applicationsRes.data : (applicationsRes.data.results || []));
+      // One summary request returns the first page of every table
+      const { data } = await api.get('/dashboard/');
+      setContactForms(data.contact_forms.items || []);
+      setReviews(data.reviews.items || []);
+      setPrograms(data.programs.items || []);
+      setHousing(data.housing.items || []);
+      setWishlists(data.wishlists.items || []);
+      setSponsors(data.donors.items || []);
+      setHousingApplications(data.housing_applications.items || []);
     } catch (error) {
       // Set empty arrays on error to prevent map errors
       setContactForms([]);
@@ -10,47 +10,24 @@ const Home = () => {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    fetchFeaturedReviews();
-    fetchSponsorFeed();
+    fetchHomepage();
   }, []);
 
-  const fetchFeaturedReviews = async () => {
+  // Featured reviews and the sponsor feed in one request
+  const fetchHomepage = async () => {
     try {
-      const response = await api.get('/reviews/featured/');
-      // Ensure reviews is always an array
-      const reviewsData = response.data;
-      if (Array.isArray(reviewsData)) {
-        setReviews(reviewsData);
-      } else if (reviewsData && Array.isArray(reviewsData.results)) {
-        // Handle paginated response
-        setReviews(reviewsData.results);
-      } else {
-        // Fallback to empty array if data is not in expected format
-        setReviews([]);
-      }
+      const response = await api.get('/homepage/');
+      const { featured_reviews: reviewsData, donor_feed: sponsorsData } = response.data || {};
+      setReviews(Array.isArray(reviewsData) ? reviewsData : []);
+      setSponsors(Array.isArray(sponsorsData) ? sponsorsData : []);
     } catch (error) {
-      setReviews([]); // Set to empty array on error
+      setReviews([]);
+      setSponsors([]);
     } finally {
       setLoading(false);
     }
   };
 
-  const fetchSponsorFeed = async () => {
-    try {
-      const response = await api.get('/donors/feed/');
-      const sponsorsData = response.data;
-      if (Array.isArray(sponsorsData)) {
-        setSponsors(sponsorsData);
-      } else if (sponsorsData && Array.isArray(sponsorsData.results)) {
-        setSponsors(sponsorsData.results);
-      } else {
-        setSponsors([]);
-      }
-    } catch (error) {
-      setSponsors([]);
-    }
-  };
-
   const renderStars = (rating) => {
     return Array.from({ length: 5 }, (_, i) => (
       <span key={i} className={i < rating ? 'star filled' : 'star'}>
@@ -59,23 +36,35 @@ const Home = () => {
     ));
   };
 
+  // Pick the smallest resized copy that still covers the screen, if the server has made them
+  const getBackgroundVariant = () => {
+    const srcset = settings.background_image_srcset || {};
+    const candidates = (srcset.webp || srcset.jpeg || '')
+      .split(',')
+      .map((entry) => entry.trim().split(' '))
+      .filter(([url, width]) => url && width)
+      .map(([url, width]) => ({ url, width: parseInt(width, 10) }))
+      .sort((a, b) => a.width - b.width);
+    if (candidates.length === 0) return null;
+    const needed = window.innerWidth * (window.devicePixelRatio || 1);
+    return (candidates.find((candidate) => candidate.width >= needed) || candidates[candidates.length - 1]).url;
+  };
+
   // Construct full URL for background image if it's a relative path
   const getBackgroundImageUrl = () => {
     if (!settings.background_image) return 'none';
     
-    let imageUrl;
+    let imageUrl = getBackgroundVariant() || settings.background_image;
     
-    // If it's already a full URL (starts with http:// or https://), use it as is
-    if (settings.background_image.startsWith('http://') || settings.background_image.startsWith('https://')) {
-      imageUrl = settings.background_image;
-    } else {
+    // Full URLs (starting with http:// or https://) are used as is
+    if (!imageUrl.startsWith('http://') && !imageUrl.startsWith('https://')) {
       // If it's a relative path, construct the full URL using API base URL
       const apiBaseUrl = process.env.REACT_APP_API_URL || 'http://localhost:8000';
       // Remove /api from the end if present, since media files are served from root
       const baseUrl = apiBaseUrl.replace(/\/api$/, '');
-      imageUrl = settings.background_image.startsWith('/') 
-        ? `${baseUrl}${settings.background_image}`
-        : `${baseUrl}/${settings.background_image}`;
+      imageUrl = imageUrl.startsWith('/') 
+        ? `${baseUrl}${imageUrl}`
+        : `${baseUrl}/${imageUrl}`;
     }
     
     // Return with proper URL formatting for CSS - use single quotes for better mobile compatibility
@@ -57,7 +57,18 @@ const Programs = () => {
                 <div key={program.id} className="program-card">
                   {program.image && (
                     <div className="program-image">
-                      <img src={program.image} alt={program.name} />
+                      <picture>
+                        {program.image_srcset && program.image_srcset.webp && (
+                          <source type="image/webp" srcSet={program.image_srcset.webp} sizes="(max-width: 768px) 100vw, 33vw" />
+                        )}
+                        <img
+                          src={program.image}
+                          srcSet={program.image_srcset && program.image_srcset.jpeg}
+                          sizes="(max-width: 768px) 100vw, 33vw"
+                          alt={program.name}
+                          loading="lazy"
+                        />
+                      </picture>
                     </div>
                   )}
                   <div className="program-content">
@@ -103,7 +114,18 @@ const Programs = () => {
                 <div key={option.id} className="housing-card">
                   {option.image && (
                     <div className="housing-image">
-                      <img src={option.image} alt={option.name} />
+                      <picture>
+                        {option.image_srcset && option.image_srcset.webp && (
+                          <source type="image/webp" srcSet={option.image_srcset.webp} sizes="(max-width: 768px) 100vw, 33vw" />
+                        )}
+                        <img
+                          src={option.image}
+                          srcSet={option.image_srcset && option.image_srcset.jpeg}
+                          sizes="(max-width: 768px) 100vw, 33vw"
+                          alt={option.name}
+                          loading="lazy"
+                        />
+                      </picture>
                     </div>
                   )}
                   <div className="housing-content">